@@ -1,3 +1,8 @@
+import time
+
+# Measure cold start from the very first line so regressions are visible
+_STARTUP_T0 = time.perf_counter()
+
 import streamlit as st
 
 # CRITICAL: st.set_page_config() MUST be the first Streamlit command
@@ -9,15 +14,57 @@ st.set_page_config(
 )
 
 import os
-import time
 import sys
+import json
 import asyncio
+import importlib.util
+import threading
 import subprocess
 
-# Function to install playwright browsers
-@st.cache_resource
-def install_playwright_browsers():
-    """Install Playwright browsers on first run"""
+def playwright_browsers_path():
+    """Directory where Playwright keeps its downloaded browsers"""
+    custom_path = os.environ.get("PLAYWRIGHT_BROWSERS_PATH")
+    if custom_path and custom_path != "0":
+        return custom_path
+    if sys.platform.startswith("win"):
+        return os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), "ms-playwright")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/ms-playwright")
+    return os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "ms-playwright")
+
+def expected_chromium_dirs():
+    """
+    Browser directories the installed Playwright expects (e.g. chromium-1140),
+    read from its bundled browsers.json; None when that file can't be found.
+    """
+    spec = importlib.util.find_spec("playwright")
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    browsers_json = os.path.join(spec.submodule_search_locations[0], "driver", "package", "browsers.json")
+    try:
+        with open(browsers_json, "r", encoding="utf-8") as f:
+            browsers = json.load(f).get("browsers", [])
+    except (OSError, ValueError):
+        return None
+    return [
+        f"{b['name']}-{b['revision']}"
+        for b in browsers
+        if b.get("name") in ("chromium", "chromium-headless-shell") and b.get("revision")
+    ]
+
+def chromium_installed():
+    """
+    Cheap filesystem check so we only shell out when Chromium is missing.
+    Only the revisions this Playwright version expects count; a browser left
+    over from an older Playwright would fail to launch.
+    """
+    dirs = expected_chromium_dirs()
+    if not dirs:
+        return False
+    root = playwright_browsers_path()
+    return all(os.path.exists(os.path.join(root, d, "INSTALLATION_COMPLETE")) for d in dirs)
+
+def _install_playwright_browsers(state):
     try:
         print("Installing Playwright browsers...")
         result = subprocess.run(
@@ -28,23 +75,43 @@ def install_playwright_browsers():
         )
         if result.returncode == 0:
             print("✓ Playwright browsers installed successfully")
-            return True
+            state["ok"] = True
         else:
             print(f"✗ Installation failed: {result.stderr}")
-            return False
+            state["ok"] = False
     except Exception as e:
         print(f"✗ Installation error: {e}")
-        return False
+        state["ok"] = False
+
+# Function to install playwright browsers
+@st.cache_resource
+def install_playwright_browsers():
+    """Install Playwright browsers on first run, in the background so the form renders immediately"""
+    state = {"ok": None, "thread": None}
+    if chromium_installed():
+        state["ok"] = True
+        return state
+    thread = threading.Thread(target=_install_playwright_browsers, args=(state,), daemon=True)
+    thread.start()
+    state["thread"] = thread
+    return state
+
+def wait_for_playwright_install():
+    """Block until any background install has finished; returns whether it succeeded"""
+    state = install_playwright_browsers()
+    thread = state["thread"]
+    if thread is not None and thread.is_alive():
+        with st.spinner("Finishing browser setup..."):
+            thread.join()
+    return state["ok"]
 
 # Run installation
-install_status = install_playwright_browsers()
+install_state = install_playwright_browsers()
 
 # Fix for Windows event loop policy
 if sys.platform.startswith("win"):
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
-from script import get_match_data, generate_pdf
-
 # Custom CSS
 st.markdown("""
     <style>
@@ -72,8 +139,9 @@ st.markdown("""
 st.title("🏏 Match Scorecard Generator")
 st.markdown("Generate a professional PDF scorecard from a CricHeroes match URL.")
 
-# Show installation status
-if not install_status:
+# Show installation status (None while a background install is still running)
+install_ok = install_state["ok"]
+if install_ok is False:
     st.warning("⚠️ Playwright installation may have issues. The app will attempt to continue.")
 
 # Add helpful instructions
@@ -107,10 +175,20 @@ with st.form("scorecard_form"):
     
     submitted = st.form_submit_button("🎯 Generate Scorecard", type="primary")
 
+# Startup timing: time from process/rerun start until the form is usable
+startup_ms = (time.perf_counter() - _STARTUP_T0) * 1000
+print(f"[STARTUP] UI ready in {startup_ms:.0f} ms")
+
 if submitted:
     if not match_url:
         st.error("❌ Please enter a valid Match URL.")
     else:
+        # Heavy imports (playwright, bs4, requests) are deferred until the first job
+        from script import get_match_data, generate_pdf, INTERACTIVE_WAIT_TIMEOUT
+        
+        if not wait_for_playwright_install() and install_ok is not False:
+            st.warning("⚠️ Playwright installation may have issues. The app will attempt to continue.")
+        
         # Create columns for better layout
         col1, col2, col3 = st.columns([1, 2, 1])
         
@@ -134,28 +212,41 @@ if submitted:
                     log_placeholder = st.empty()
                 
                 # Call the scraping function
-                import io
-                import sys
-                from contextlib import redirect_stderr
+                from job_log import JobLog, LISTENER_INTERVAL
                 
-                # Capture stderr to show progress
-                stderr_capture = io.StringIO()
+                # This job's own bounded log, redrawn in the expander at most every LISTENER_INTERVAL
+                job = JobLog(
+                    listener=lambda line: log_placeholder.code(job.text(), language="log"),
+                    listener_interval=LISTENER_INTERVAL,
+                )
                 
                 try:
-                    with redirect_stderr(stderr_capture):
-                        data_packet = get_match_data(match_url)
+                    # Finished matches prefetched by the tournament crawler need no scraping
+                    import match_cache
+                    data_packet = match_cache.get(match_url)
+                    if data_packet is not None:
+                        job.logger.info("✓ Served from prefetch cache")
+                    else:
+                        data_packet = get_match_data(match_url, log=job.logger, wait_timeout=INTERACTIVE_WAIT_TIMEOUT)
                     
-                    # Show captured logs
-                    logs = stderr_capture.getvalue()
-                    if logs:
-                        log_placeholder.code(logs, language="log")
-                    
-                except Exception as scrape_error:
-                    # Show captured logs even on error
-                    logs = stderr_capture.getvalue()
-                    if logs:
-                        log_placeholder.code(logs, language="log")
-                    raise scrape_error
+                finally:
+                    # Show the full log, on error too, including lines the throttle held back
+                    job.flush()
+                
+                # Keep finished matches for season statistics; a live match would add
+                # partial innings to the leaderboards. Never fail the job over it.
+                try:
+                    import match_store
+                    from watch import match_finished
+                    if match_finished(data_packet):
+                        store = match_store.connect()
+                        try:
+                            # Same key as the prefetch cache, so every URL shape of a match is one row
+                            match_store.ingest_match(store, match_cache.match_key(match_url), data_packet)
+                        finally:
+                            store.close()
+                except Exception as store_error:
+                    print(f"✗ Could not store match: {store_error}")
                 
                 progress_bar.progress(60, text="Data extracted!")
                 status_text.success("✅ Data extracted successfully!")
@@ -176,7 +267,7 @@ if submitted:
                 output_filename = "scorecard.pdf"
                 
                 try:
-                    generate_pdf(data_packet, output_filename)
+                    generate_pdf(data_packet, output_filename, log=job.logger)
                     
                     # Verify PDF was created
                     if not os.path.exists(output_filename):
@@ -192,6 +283,8 @@ if submitted:
                 except Exception as pdf_error:
                     st.error(f"❌ PDF Generation Failed: {str(pdf_error)}")
                     raise
+                finally:
+                    job.flush()
                 
                 progress_bar.progress(100, text="Complete!")
                 status_text.success("✅ Scorecard generated successfully!")
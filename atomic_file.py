@@ -0,0 +1,26 @@
+import os
+import tempfile
+
+
+def write(path, data, prefix=".tmp."):
+    """
+    Write str or bytes to `path` atomically: the data goes to a temp file in
+    the same directory, which is then renamed over `path`, so concurrent
+    readers never see a partial file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=prefix, dir=directory)
+    try:
+        if isinstance(data, bytes):
+            f = os.fdopen(fd, "wb")
+        else:
+            f = os.fdopen(fd, "w", encoding="utf-8")
+        with f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
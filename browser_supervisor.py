@@ -0,0 +1,280 @@
+import contextlib
+import os
+import signal
+import threading
+import uuid
+
+import job_log
+
+# Recycle a browser at the next check() once it grows past this resident size
+MAX_RSS_MB = int(os.getenv("BROWSER_MAX_RSS_MB", "1024"))
+# Past this size the watchdog kills the browser at once rather than let it take the worker down
+KILL_RSS_MB = int(os.getenv("BROWSER_KILL_RSS_MB", str(MAX_RSS_MB * 3 // 2)))
+# Seconds between watchdog RSS samples, so long waits (goto, Cloudflare, selectors) are covered too
+SAMPLE_INTERVAL = float(os.getenv("BROWSER_SAMPLE_INTERVAL", "2"))
+
+# Unique per launch; Chromium ignores unknown switches, and /proc/<pid>/cmdline
+# shows which browser process belongs to which supervisor
+LAUNCH_MARKER_ARG = "--scrapper-launch-id"
+
+METRICS = {
+    'launches': 0,
+    'recycles': 0,
+    'crashes': 0,
+    'memory_kills': 0,
+    'orphans_killed': 0,
+    'pages_opened': 0,
+    'active_browsers': 0,
+    'last_rss_mb': 0.0,
+    'peak_rss_mb': 0.0,
+}
+_metrics_lock = threading.Lock()
+
+
+def _bump(key, amount=1):
+    with _metrics_lock:
+        METRICS[key] += amount
+
+
+def get_metrics():
+    """Snapshot of the browser counters and memory gauges."""
+    with _metrics_lock:
+        return dict(METRICS)
+
+
+def _process_tree():
+    """Map of pid -> parent pid for every running (non-zombie) process."""
+    try:
+        import psutil
+        return {
+            p.info['pid']: p.info['ppid']
+            for p in psutil.process_iter(['pid', 'ppid', 'status'])
+            if p.info['status'] != psutil.STATUS_ZOMBIE
+        }
+    except ImportError:
+        pass
+    except Exception:
+        return {}
+
+    tree = {}
+    if not os.path.isdir("/proc"):
+        return tree
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "r") as f:
+                # The command name may contain spaces, so split after its closing paren
+                fields = f.read().rsplit(")", 1)[1].split()
+            if fields[0] != "Z":
+                tree[int(name)] = int(fields[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    return tree
+
+
+def _descendants(root_pids, tree=None):
+    tree = _process_tree() if tree is None else tree
+    children = {}
+    for pid, ppid in tree.items():
+        children.setdefault(ppid, []).append(pid)
+
+    found = set()
+    stack = list(root_pids)
+    while stack:
+        pid = stack.pop()
+        for child in children.get(pid, []):
+            if child not in found:
+                found.add(child)
+                stack.append(child)
+    return found
+
+
+def _rss_bytes(pid):
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except ImportError:
+        pass
+    except Exception:
+        return 0
+
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, IndexError, ValueError, AttributeError):
+        return 0
+
+
+def _cmdline(pid):
+    try:
+        import psutil
+        return psutil.Process(pid).cmdline()
+    except ImportError:
+        pass
+    except Exception:
+        return []
+
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return [arg.decode("utf-8", "replace") for arg in f.read().split(b"\0") if arg]
+    except OSError:
+        return []
+
+
+def _marked_processes(marker, tree):
+    """Our descendants launched with `marker`, plus everything they spawned."""
+    roots = {pid for pid in _descendants([os.getpid()], tree) if marker in _cmdline(pid)}
+    return roots | _descendants(roots, tree)
+
+
+def _kill(pid):
+    try:
+        os.kill(pid, signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+        return True
+    except OSError:
+        return False
+
+
+class SupervisedBrowser:
+    """
+    A Chromium instance whose processes and resident memory are tracked, so it
+    can be recycled before it takes the worker down and its processes can be
+    killed if Playwright fails to close it. A watchdog thread samples RSS every
+    `sample_interval` seconds, including while the caller is blocked in a wait.
+    """
+
+    def __init__(self, playwright, args, max_rss_mb=MAX_RSS_MB, kill_rss_mb=KILL_RSS_MB,
+                 sample_interval=SAMPLE_INTERVAL, log=None):
+        self.playwright = playwright
+        self.args = args
+        self.max_rss_mb = max_rss_mb
+        self.kill_rss_mb = kill_rss_mb
+        self.sample_interval = sample_interval
+        self.log = log or job_log.default_logger()
+        self.browser = None
+        self.pids = set()
+        self.pages = 0
+        # (rss_mb, processes_killed) once the watchdog has killed the current browser
+        self.memory_kill = None
+        self._pids_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._launch()
+        self._watchdog = threading.Thread(target=self._watch, daemon=True, name="browser-watchdog")
+        self._watchdog.start()
+
+    def _launch(self):
+        marker = f"{LAUNCH_MARKER_ARG}={uuid.uuid4().hex}"
+        self.browser = self.playwright.chromium.launch(headless=True, args=list(self.args) + [marker])
+        pids = _marked_processes(marker, _process_tree())
+        with self._pids_lock:
+            self.pids = pids
+        self.pages = 0
+        self.memory_kill = None
+        _bump('launches')
+        _bump('active_browsers')
+        self.log.debug("Browser launched (%s processes)", len(pids))
+
+    def _live_pids(self):
+        tree = _process_tree()
+        with self._pids_lock:
+            pids = set(self.pids)
+        return {pid for pid in pids if pid in tree} | _descendants(pids, tree)
+
+    def _watch(self):
+        # Never logs: the job logger may feed a UI that only accepts calls from the
+        # job's own thread. Kills are recorded and reported by check()/shutdown().
+        while not self._stop.wait(self.sample_interval):
+            try:
+                rss = self.rss_mb()
+                if rss > self.kill_rss_mb and self.memory_kill is None:
+                    killed = sum(1 for pid in self._live_pids() if _kill(pid))
+                    self.memory_kill = (rss, killed)
+                    _bump('memory_kills')
+            except Exception:
+                continue
+
+    def _report_memory_kill(self):
+        if self.memory_kill is not None:
+            rss, killed = self.memory_kill
+            self.log.warning("Watchdog killed the browser at %.0f MB RSS (%s processes)", rss, killed)
+
+    def rss_mb(self):
+        """Resident memory of every process belonging to this browser, in MB."""
+        rss = sum(_rss_bytes(pid) for pid in self._live_pids()) / (1024 * 1024)
+        with _metrics_lock:
+            METRICS['last_rss_mb'] = rss
+            METRICS['peak_rss_mb'] = max(METRICS['peak_rss_mb'], rss)
+        return rss
+
+    def new_context(self, **kwargs):
+        return self.browser.new_context(**kwargs)
+
+    def new_page(self, context=None):
+        self.pages += 1
+        _bump('pages_opened')
+        return (context or self.browser).new_page()
+
+    def check(self):
+        """
+        Recycle the browser if it crashed, was killed by the watchdog or is
+        past max_rss_mb. Returns True when a new browser was launched; existing
+        contexts and pages are gone in that case and must be recreated.
+        """
+        if self.memory_kill is not None or not self.browser.is_connected():
+            # A watchdog kill is reported by shutdown() during the recycle
+            if self.memory_kill is None:
+                self.log.warning("Browser disconnected, relaunching")
+                _bump('crashes')
+            self.recycle()
+            return True
+
+        rss = self.rss_mb()
+        if rss > self.max_rss_mb:
+            self.log.info("Recycling browser (%.0f MB RSS, %s pages)", rss, self.pages)
+            self.recycle()
+            return True
+        return False
+
+    def recycle(self):
+        self.shutdown()
+        _bump('recycles')
+        self._launch()
+
+    def shutdown(self):
+        """Close the browser, then kill any of its processes that survived."""
+        if self.browser is None:
+            return
+        self._report_memory_kill()
+        pids = self._live_pids()
+        try:
+            self.rss_mb()
+            self.browser.close()
+        except Exception as e:
+            self.log.warning("Browser close failed: %s", e)
+        self.browser = None
+        with self._pids_lock:
+            self.pids = set()
+        _bump('active_browsers', -1)
+
+        survivors = pids & set(_process_tree())
+        killed = sum(1 for pid in survivors if _kill(pid))
+        if killed:
+            self.log.warning("Killed %s orphaned Chromium processes", killed)
+            _bump('orphans_killed', killed)
+
+    def close(self):
+        """Stop the watchdog and shut the browser down for good."""
+        self._stop.set()
+        self._watchdog.join()
+        self.shutdown()
+
+
+@contextlib.contextmanager
+def supervised_browser(playwright, args, log=None, max_rss_mb=MAX_RSS_MB, kill_rss_mb=KILL_RSS_MB):
+    """Launch a supervised browser and always shut it down, even when the body raises."""
+    supervisor = SupervisedBrowser(playwright, args, max_rss_mb=max_rss_mb, kill_rss_mb=kill_rss_mb, log=log)
+    try:
+        yield supervisor
+    finally:
+        supervisor.close()
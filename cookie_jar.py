@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+import time
+
+import atomic_file
+
+# Shared on-disk jar for cookies earned by the Playwright path (e.g. Cloudflare
+# clearance) so the fast `requests` path can reuse them until they expire.
+COOKIE_JAR_PATH = os.getenv("COOKIE_JAR_PATH", ".cookie_jar.json")
+
+# Session cookies (expires == -1) die with the browser context, so give them a
+# conservative lifetime instead of keeping them forever.
+SESSION_COOKIE_TTL = 30 * 60
+
+_lock = threading.Lock()
+
+
+def _read_jar(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_jar(path, jar):
+    """Write the jar atomically so concurrent readers never see a partial file."""
+    atomic_file.write(path, json.dumps(jar), prefix=".cookie_jar.")
+
+
+def _live_cookies(cookies, now):
+    return [c for c in cookies if c.get('expires', 0) > now]
+
+
+def save_storage_state(state, user_agent, path=None):
+    """
+    Merge the cookies from a Playwright `storage_state()` into the shared jar.
+    Cookies are keyed by (name, domain, path); newer values replace older ones.
+    """
+    path = path or COOKIE_JAR_PATH
+    now = time.time()
+
+    fresh = []
+    for c in state.get('cookies', []):
+        expires = c.get('expires', -1)
+        if not expires or expires < 0:
+            expires = now + SESSION_COOKIE_TTL
+        if expires <= now:
+            continue
+        fresh.append({
+            'name': c.get('name'),
+            'value': c.get('value'),
+            'domain': c.get('domain', ''),
+            'path': c.get('path', '/'),
+            'secure': bool(c.get('secure', False)),
+            'expires': expires,
+        })
+
+    with _lock:
+        jar = _read_jar(path)
+        merged = {
+            (c['name'], c['domain'], c['path']): c
+            for c in _live_cookies(jar.get('cookies', []), now)
+        }
+        for c in fresh:
+            merged[(c['name'], c['domain'], c['path'])] = c
+
+        jar = {
+            'user_agent': user_agent,
+            'saved_at': now,
+            'cookies': list(merged.values()),
+        }
+        _write_jar(path, jar)
+
+    return len(fresh)
+
+
+def load_cookies(path=None):
+    """Return (cookies, user_agent) for every cookie in the jar that has not expired."""
+    path = path or COOKIE_JAR_PATH
+    with _lock:
+        jar = _read_jar(path)
+    cookies = _live_cookies(jar.get('cookies', []), time.time())
+    if not cookies:
+        return [], None
+    return cookies, jar.get('user_agent')
+
+
+def expires_at(path=None):
+    """Earliest expiry among the live cookies, or None when the jar is empty."""
+    cookies, _ = load_cookies(path)
+    if not cookies:
+        return None
+    return min(c['expires'] for c in cookies)
+
+
+def apply_to_session(session, path=None):
+    """
+    Load live cookies into a `requests.Session`.
+    Returns the user agent the cookies were issued to (clearance cookies are
+    bound to it), or None when there is nothing usable in the jar.
+    """
+    cookies, user_agent = load_cookies(path)
+    for c in cookies:
+        session.cookies.set(
+            c['name'],
+            c['value'],
+            domain=c['domain'],
+            path=c['path'],
+            secure=c['secure'],
+            expires=int(c['expires']),
+        )
+    return user_agent
+
+
+def clear(path=None):
+    """Drop the jar, e.g. when the site rejects the stored clearance."""
+    path = path or COOKIE_JAR_PATH
+    with _lock:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
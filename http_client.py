@@ -0,0 +1,202 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import cookie_jar
+import rate_limiter
+
+
+def _decodable_encodings():
+    """
+    Content codings the fast path can actually decode.
+    gzip/deflate are built in; Brotli only works when urllib3 (and httpx)
+    can import one of the optional Brotli packages.
+    """
+    encodings = ["gzip", "deflate"]
+    for module in ("brotli", "brotlicffi"):
+        try:
+            __import__(module)
+            encodings.append("br")
+            break
+        except ImportError:
+            continue
+    return encodings
+
+
+DECODABLE_ENCODINGS = _decodable_encodings()
+ACCEPT_ENCODING = ", ".join(DECODABLE_ENCODINGS)
+
+# Why fast-path fetches ended up falling back to Playwright
+FALLBACK_STATS = {
+    'requests': 0,
+    'ok': 0,
+    'decode_errors': 0,
+    'bad_status': 0,
+    'missing_next_data': 0,
+    'network_errors': 0,
+    'rate_limited': 0,
+}
+_stats_lock = threading.Lock()
+
+
+def _record(key):
+    with _stats_lock:
+        FALLBACK_STATS[key] += 1
+
+
+def get_fallback_stats():
+    """Snapshot of the fast-path counters."""
+    with _stats_lock:
+        return dict(FALLBACK_STATS)
+
+
+def _http2_available():
+    try:
+        import httpx  # noqa: F401
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def is_decodable(headers):
+    """True when every coding in Content-Encoding is one we can decode."""
+    value = headers.get('Content-Encoding', '') or ''
+    codings = [c.strip().lower() for c in value.split(',') if c.strip()]
+    return all(c == 'identity' or c in DECODABLE_ENCODINGS for c in codings)
+
+
+def _classify(status_code, headers, text):
+    """Return the fallback reason for a response, or None when it is usable."""
+    if not is_decodable(headers):
+        return 'decode_errors'
+    if status_code != 200:
+        return 'bad_status'
+    if "__NEXT_DATA__" not in text:
+        return 'missing_next_data'
+    return None
+
+
+def fetch_page(session, url, headers, timeout=15, wait_timeout=None):
+    """
+    Fetch a scorecard page with a `requests.Session`.
+    Returns (content, status_code, reason); content is None when the caller
+    should fall back to the browser, and reason names the FALLBACK_STATS key.
+    With wait_timeout, gives up with reason 'rate_limited' instead of waiting
+    longer than that for the host's rate limiter.
+    """
+    _record('requests')
+    try:
+        rate_limiter.acquire(url, timeout=wait_timeout)
+    except TimeoutError:
+        _record('rate_limited')
+        return None, None, 'rate_limited'
+    try:
+        r = session.get(url, headers=headers, timeout=timeout)
+    except requests.exceptions.ContentDecodingError:
+        _record('decode_errors')
+        return None, None, 'decode_errors'
+    except requests.exceptions.RequestException:
+        _record('network_errors')
+        raise
+
+    rate_limiter.report(url, r.status_code, r.headers.get('Retry-After'))
+    reason = _classify(r.status_code, r.headers, r.text)
+    if reason:
+        _record(reason)
+        return None, r.status_code, reason
+
+    _record('ok')
+    return r.text, r.status_code, None
+
+
+async def _fetch_many_http2(urls, headers, timeout, max_concurrency):
+    import httpx
+
+    cookies = httpx.Cookies()
+    jar_cookies, jar_user_agent = cookie_jar.load_cookies()
+    for c in jar_cookies:
+        cookies.set(c['name'], c['value'], domain=c['domain'], path=c['path'])
+    # Cloudflare ties its clearance cookie to the UA that earned it
+    if jar_user_agent:
+        headers = dict(headers, **{"User-Agent": jar_user_agent})
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results = {}
+
+    async with httpx.AsyncClient(
+        http2=True,
+        headers=headers,
+        cookies=cookies,
+        timeout=timeout,
+        follow_redirects=True,
+    ) as client:
+
+        async def fetch_one(url):
+            async with semaphore:
+                _record('requests')
+                await asyncio.to_thread(rate_limiter.acquire, url)
+                try:
+                    r = await client.get(url)
+                    text = r.text
+                except httpx.DecodingError:
+                    _record('decode_errors')
+                    results[url] = None
+                    return
+                except httpx.HTTPError:
+                    _record('network_errors')
+                    results[url] = None
+                    return
+
+            # report() blocks on SQLite, so keep it off the event loop like acquire()
+            await asyncio.to_thread(rate_limiter.report, url, r.status_code, r.headers.get('Retry-After'))
+            reason = _classify(r.status_code, r.headers, text)
+            if reason:
+                _record(reason)
+                results[url] = None
+            else:
+                _record('ok')
+                results[url] = text
+
+        # All requests share one multiplexed HTTP/2 connection per host
+        await asyncio.gather(*(fetch_one(url) for url in urls))
+
+    return results
+
+
+def _fetch_many_threaded(urls, headers, timeout, max_concurrency):
+    session = requests.Session()
+    jar_user_agent = cookie_jar.apply_to_session(session)
+    if jar_user_agent:
+        headers = dict(headers, **{"User-Agent": jar_user_agent})
+
+    def fetch_one(url):
+        try:
+            content, _, _ = fetch_page(session, url, headers, timeout)
+        except requests.exceptions.RequestException:
+            content = None
+        return url, content
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        return dict(executor.map(fetch_one, urls))
+
+
+def fetch_many(urls, headers, timeout=15, max_concurrency=8):
+    """
+    Fetch several pages on the fast path.
+    Uses HTTP/2 multiplexing when httpx and h2 are installed, otherwise a small
+    thread pool over a shared keep-alive session. Returns {url: content or None}.
+    """
+    urls = list(urls)
+    if not urls:
+        return {}
+
+    headers = dict(headers, **{"Accept-Encoding": ACCEPT_ENCODING})
+    # HTTP/2 forbids connection-specific headers
+    headers.pop("Connection", None)
+
+    if _http2_available():
+        return asyncio.run(_fetch_many_http2(urls, headers, timeout, max_concurrency))
+    return _fetch_many_threaded(urls, headers, timeout, max_concurrency)
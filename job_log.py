@@ -0,0 +1,123 @@
+import collections
+import itertools
+import logging
+import os
+import sys
+import time
+
+# Default verbosity for scrape jobs; set SCRAPER_LOG_LEVEL=INFO to drop the
+# chatty per-step messages entirely (disabled records are never formatted).
+LOG_LEVEL = os.getenv("SCRAPER_LOG_LEVEL", "DEBUG").upper()
+
+# How many lines a job keeps before the oldest ones are discarded
+DEFAULT_CAPACITY = 500
+
+# Minimum seconds between listener calls; lines in between are picked up by the next call or flush()
+LISTENER_INTERVAL = 0.25
+
+FORMATTER = logging.Formatter("[%(levelname)s] %(message)s")
+
+_job_ids = itertools.count(1)
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Keeps the last `capacity` formatted lines of one job in memory and
+    optionally forwards new lines to a listener (e.g. a UI placeholder),
+    at most once every `listener_interval` seconds.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, listener=None, listener_interval=0):
+        super().__init__()
+        self.buffer = collections.deque(maxlen=capacity)
+        self.dropped = 0
+        self.listener = listener
+        self.listener_interval = listener_interval
+        self._last_notified = None
+        self._pending = False
+
+    def emit(self, record):
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self.lock:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+            self.buffer.append(line)
+            self._pending = True
+            now = time.monotonic()
+            due = self._last_notified is None or now - self._last_notified >= self.listener_interval
+            if due:
+                self._last_notified = now
+                self._pending = False
+        if self.listener and due:
+            try:
+                self.listener(line)
+            except Exception:
+                self.handleError(record)
+
+    def flush(self):
+        """Forward the latest line to the listener if any arrived since the last call."""
+        with self.lock:
+            if not self._pending or not self.buffer:
+                return
+            self._pending = False
+            self._last_notified = time.monotonic()
+            line = self.buffer[-1]
+        if self.listener:
+            try:
+                self.listener(line)
+            except Exception:
+                pass
+
+    def lines(self):
+        with self.lock:
+            return list(self.buffer)
+
+
+class JobLog:
+    """
+    A logger that belongs to a single scrape job.
+    The logger is not registered with the logging module, so it never receives
+    another job's records and is freed together with the job.
+    """
+
+    def __init__(self, job_id=None, level=None, capacity=DEFAULT_CAPACITY, listener=None, echo=False,
+                 listener_interval=0):
+        self.job_id = job_id or f"job-{next(_job_ids)}"
+        self.handler = RingBufferHandler(capacity, listener, listener_interval)
+        self.handler.setFormatter(FORMATTER)
+
+        self.logger = logging.Logger(f"scrapper.{self.job_id}", level or LOG_LEVEL)
+        self.logger.addHandler(self.handler)
+        if echo:
+            stream_handler = logging.StreamHandler(sys.stderr)
+            stream_handler.setFormatter(FORMATTER)
+            self.logger.addHandler(stream_handler)
+
+    def lines(self):
+        return self.handler.lines()
+
+    def flush(self):
+        """Push any lines the listener throttle held back."""
+        self.handler.flush()
+
+    def text(self):
+        lines = self.handler.lines()
+        if self.handler.dropped:
+            lines.insert(0, f"... {self.handler.dropped} earlier lines dropped ...")
+        return "\n".join(lines)
+
+
+def default_logger():
+    """Process-wide stderr logger used when no job logger is supplied (CLI runs)."""
+    logger = logging.getLogger("scrapper")
+    if not logger.handlers:
+        stream_handler = logging.StreamHandler(sys.stderr)
+        stream_handler.setFormatter(FORMATTER)
+        logger.addHandler(stream_handler)
+        logger.setLevel(LOG_LEVEL)
+        logger.propagate = False
+    return logger
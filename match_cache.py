@@ -0,0 +1,54 @@
+import hashlib
+import json
+import os
+import re
+
+import atomic_file
+
+# Packets for finished matches, so requests for them skip scraping entirely.
+# Finished scorecards never change, so entries do not expire.
+MATCH_CACHE_DIR = os.getenv("MATCH_CACHE_DIR", ".match_cache")
+
+_MATCH_ID_RE = re.compile(r"/(?:scorecard|match)/(\d+)")
+
+# A value that already is a key (match id or URL digest) maps to itself
+_KEY_RE = re.compile(r"\d+|[0-9a-f]{40}")
+
+
+def match_key(url):
+    """
+    Stable key for a match URL. Users paste many URL shapes for the same
+    match, so prefer the numeric match id when the URL carries one.
+    Passing a key back in returns it unchanged.
+    """
+    url = url.strip()
+    if _KEY_RE.fullmatch(url):
+        return url
+    match = _MATCH_ID_RE.search(url)
+    if match:
+        return match.group(1)
+    return hashlib.sha1(url.rstrip('/').encode("utf-8")).hexdigest()
+
+
+def _path(url, cache_dir):
+    return os.path.join(cache_dir or MATCH_CACHE_DIR, f"{match_key(url)}.json")
+
+
+def get(url, cache_dir=None):
+    """Cached data packet for a match URL, or None."""
+    try:
+        with open(_path(url, cache_dir), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def contains(url, cache_dir=None):
+    return os.path.exists(_path(url, cache_dir))
+
+
+def put(url, data_packet, cache_dir=None):
+    """Store a packet atomically so a concurrent reader never sees half a file."""
+    cache_dir = cache_dir or MATCH_CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+    atomic_file.write(_path(url, cache_dir), json.dumps(data_packet), prefix=".match.")
@@ -0,0 +1,254 @@
+import os
+import sqlite3
+import time
+
+import match_cache
+
+# Local store of every scraped match, used for cross-match player statistics
+MATCH_STORE_PATH = os.getenv("MATCH_STORE_PATH", "matches.db")
+
+# Matches written per transaction during bulk ingest
+BATCH_SIZE = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    match_key TEXT PRIMARY KEY,
+    tournament TEXT,
+    team1 TEXT,
+    team2 TEXT,
+    result TEXT,
+    man_of_the_match TEXT,
+    match_overs TEXT,
+    ingested_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS innings (
+    match_key TEXT NOT NULL REFERENCES matches(match_key) ON DELETE CASCADE,
+    inning_no INTEGER NOT NULL,
+    team TEXT,
+    tournament TEXT,
+    score TEXT,
+    overs TEXT,
+    PRIMARY KEY (match_key, inning_no)
+);
+
+CREATE TABLE IF NOT EXISTS batting (
+    match_key TEXT NOT NULL REFERENCES matches(match_key) ON DELETE CASCADE,
+    inning_no INTEGER NOT NULL,
+    team TEXT,
+    tournament TEXT,
+    player TEXT NOT NULL,
+    runs INTEGER,
+    balls INTEGER,
+    fours INTEGER,
+    sixes INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS bowling (
+    match_key TEXT NOT NULL REFERENCES matches(match_key) ON DELETE CASCADE,
+    inning_no INTEGER NOT NULL,
+    team TEXT,
+    tournament TEXT,
+    player TEXT NOT NULL,
+    overs TEXT,
+    balls INTEGER,
+    runs INTEGER,
+    wickets INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_matches_tournament ON matches(tournament);
+CREATE INDEX IF NOT EXISTS idx_batting_player ON batting(player);
+CREATE INDEX IF NOT EXISTS idx_batting_team ON batting(team);
+CREATE INDEX IF NOT EXISTS idx_batting_tournament_player ON batting(tournament, player);
+CREATE INDEX IF NOT EXISTS idx_batting_match ON batting(match_key);
+CREATE INDEX IF NOT EXISTS idx_bowling_player ON bowling(player);
+CREATE INDEX IF NOT EXISTS idx_bowling_team ON bowling(team);
+CREATE INDEX IF NOT EXISTS idx_bowling_tournament_player ON bowling(tournament, player);
+CREATE INDEX IF NOT EXISTS idx_bowling_match ON bowling(match_key);
+"""
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def overs_to_balls(overs):
+    """Convert cricket overs notation ("3.4" = 3 overs 4 balls) to legal balls."""
+    try:
+        whole, _, part = str(overs).partition('.')
+        return int(whole or 0) * 6 + int(part or 0)
+    except ValueError:
+        return 0
+
+
+def connect(path=None):
+    """Open (and if needed create) the store."""
+    conn = sqlite3.connect(path or MATCH_STORE_PATH)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def fielding_team(match_data, inning_no):
+    """
+    Team that bowled in innings `inning_no` of a scorecard; the bowling card of
+    an innings belongs to the fielding side, i.e. the other team.
+    """
+    if len(match_data) > 1 and inning_no < 2:
+        return match_data[1 - inning_no].get('teamName', 'Opponent')
+    return 'Opponent'
+
+
+def _rows_for_match(match_key, data_packet):
+    """Flatten one data packet into rows for each table."""
+    match_data = data_packet.get('scorecard', [])
+    meta_info = data_packet.get('meta', {})
+    tournament = meta_info.get('tournament_name', 'N/A')
+
+    team1 = match_data[0].get('teamName', 'Team A') if len(match_data) > 0 else 'Team A'
+    team2 = match_data[1].get('teamName', 'Team B') if len(match_data) > 1 else 'Team B'
+    match_row = (
+        match_key, tournament, team1, team2,
+        meta_info.get('result', 'N/A'),
+        meta_info.get('man_of_the_match', 'N/A'),
+        str(meta_info.get('match_overs', 'N/A')),
+        time.time(),
+    )
+
+    innings_rows, batting_rows, bowling_rows = [], [], []
+    for i, inning in enumerate(match_data):
+        team = inning.get('teamName', 'Unknown')
+        opponent = fielding_team(match_data, i)
+        summary = inning.get('inning', {}).get('summary', {})
+        innings_rows.append((match_key, i, team, tournament, summary.get('score', '0/0'), str(summary.get('over', ''))))
+
+        for b in inning.get('batting', []):
+            batting_rows.append((
+                match_key, i, team, tournament, b.get('name', ''),
+                _to_int(b.get('runs')), _to_int(b.get('balls')),
+                _to_int(b.get('4s')), _to_int(b.get('6s')),
+            ))
+        for b in inning.get('bowling', []):
+            bowling_rows.append((
+                match_key, i, opponent, tournament, b.get('name', ''),
+                str(b.get('overs', 0)), overs_to_balls(b.get('overs', 0)),
+                _to_int(b.get('runs')), _to_int(b.get('wickets')),
+            ))
+
+    return match_row, innings_rows, batting_rows, bowling_rows
+
+
+def _write_matches(conn, items):
+    # Keys are normalized so every URL shape of a match lands on one row;
+    # a match seen twice in one batch keeps its last packet
+    latest = {match_cache.match_key(key): data_packet for key, data_packet in items}
+
+    match_rows, innings_rows, batting_rows, bowling_rows = [], [], [], []
+    for match_key, data_packet in latest.items():
+        m, inn, bat, bowl = _rows_for_match(match_key, data_packet)
+        match_rows.append(m)
+        innings_rows += inn
+        batting_rows += bat
+        bowling_rows += bowl
+
+    # Re-ingesting a match replaces it; ON DELETE CASCADE drops the old rows
+    conn.executemany("DELETE FROM matches WHERE match_key = ?", [(m[0],) for m in match_rows])
+    conn.executemany("INSERT INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?)", match_rows)
+    conn.executemany("INSERT INTO innings VALUES (?, ?, ?, ?, ?, ?)", innings_rows)
+    conn.executemany("INSERT INTO batting VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", batting_rows)
+    conn.executemany("INSERT INTO bowling VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", bowling_rows)
+    return latest.keys()
+
+
+def ingest_match(conn, match_key, data_packet):
+    """
+    Store one packet from get_match_data. `match_key` may be the match URL;
+    it is normalized with match_cache.match_key.
+    """
+    with conn:
+        _write_matches(conn, [(match_key, data_packet)])
+
+
+def bulk_ingest(conn, items, batch_size=BATCH_SIZE):
+    """
+    Store many (match_key, data_packet) pairs, committing once per batch
+    instead of once per match. Returns the number of distinct matches written.
+    """
+    written = set()
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            with conn:
+                written.update(_write_matches(conn, batch))
+            batch = []
+    if batch:
+        with conn:
+            written.update(_write_matches(conn, batch))
+    return len(written)
+
+
+def top_run_scorers(conn, tournament=None, team=None, limit=10):
+    """Leaderboard of total runs, optionally filtered by tournament and/or team."""
+    where, params = _filters(tournament, team)
+    return conn.execute(f"""
+        SELECT player, team,
+               COUNT(DISTINCT match_key) AS matches,
+               SUM(runs) AS runs, SUM(balls) AS balls,
+               SUM(fours) AS fours, SUM(sixes) AS sixes,
+               MAX(runs) AS highest
+        FROM batting {where}
+        GROUP BY player, team
+        ORDER BY runs DESC, balls ASC
+        LIMIT ?
+    """, params + [limit]).fetchall()
+
+
+def top_wicket_takers(conn, tournament=None, team=None, limit=10):
+    """Leaderboard of total wickets, ties broken by fewer runs conceded."""
+    where, params = _filters(tournament, team)
+    return conn.execute(f"""
+        SELECT player, team,
+               COUNT(DISTINCT match_key) AS matches,
+               SUM(wickets) AS wickets, SUM(runs) AS runs, SUM(balls) AS balls
+        FROM bowling {where}
+        GROUP BY player, team
+        ORDER BY wickets DESC, runs ASC
+        LIMIT ?
+    """, params + [limit]).fetchall()
+
+
+def best_bowling_figures(conn, tournament=None, team=None, limit=10):
+    """Best single-innings figures (most wickets, then fewest runs)."""
+    where, params = _filters(tournament, team)
+    return conn.execute(f"""
+        SELECT player, team, match_key, overs, runs, wickets
+        FROM bowling {where}
+        ORDER BY wickets DESC, runs ASC
+        LIMIT ?
+    """, params + [limit]).fetchall()
+
+
+def player_matches(conn, player):
+    """Every batting and bowling row recorded for one player."""
+    batting = conn.execute("SELECT * FROM batting WHERE player = ?", (player,)).fetchall()
+    bowling = conn.execute("SELECT * FROM bowling WHERE player = ?", (player,)).fetchall()
+    return {'batting': batting, 'bowling': bowling}
+
+
+def _filters(tournament, team):
+    clauses, params = [], []
+    if tournament is not None:
+        clauses.append("tournament = ?")
+        params.append(tournament)
+    if team is not None:
+        clauses.append("team = ?")
+        params.append(team)
+    where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+    return where, params
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import threading
+
+import atomic_file
+
+# Rendered PDFs keyed by a hash of the report HTML, evicted least-recently-used
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", ".pdf_cache")
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+CACHE_STATS = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+_lock = threading.Lock()
+
+
+def cache_key(html_content, template_version, renderer):
+    """
+    Content address for a render. The HTML already reflects the packet and any
+    overrides (e.g. Man of the Match); the template version covers renderer
+    settings that are not visible in the HTML, and the renderer name keeps
+    WeasyPrint and Chromium output apart.
+    """
+    digest = hashlib.sha256()
+    digest.update(str(template_version).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(str(renderer).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(html_content.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _path(key, cache_dir):
+    return os.path.join(cache_dir, f"{key}.pdf")
+
+
+def _count(name):
+    with _lock:
+        CACHE_STATS[name] += 1
+
+
+def get(key, cache_dir=None):
+    """Return cached PDF bytes for `key`, or None on a miss."""
+    path = _path(key, cache_dir or PDF_CACHE_DIR)
+    try:
+        with open(path, "rb") as f:
+            pdf_bytes = f.read()
+    except OSError:
+        _count('misses')
+        return None
+
+    # Touch so the entry counts as recently used for eviction
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    _count('hits')
+    return pdf_bytes
+
+
+def put(key, pdf_bytes, cache_dir=None, max_bytes=None):
+    """Store PDF bytes under `key`, then trim the cache back under its size limit."""
+    cache_dir = cache_dir or PDF_CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # Dot-prefixed temp files are skipped by _evict while they are being written
+    atomic_file.write(_path(key, cache_dir), pdf_bytes, prefix=".pdf.")
+
+    _count('stores')
+    _evict(cache_dir, PDF_CACHE_MAX_BYTES if max_bytes is None else max_bytes)
+
+
+def _evict(cache_dir, max_bytes):
+    entries = []
+    total = 0
+    for entry in os.scandir(cache_dir):
+        if not entry.name.endswith(".pdf") or entry.name.startswith("."):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total += stat.st_size
+
+    # Oldest access first
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        _count('evictions')
+
+
+def cache_stats():
+    """Counters plus the hit rate over all lookups so far."""
+    with _lock:
+        stats = dict(CACHE_STATS)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    return stats
+
+
+def clear(cache_dir=None):
+    cache_dir = cache_dir or PDF_CACHE_DIR
+    if not os.path.isdir(cache_dir):
+        return
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".pdf"):
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
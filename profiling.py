@@ -0,0 +1,108 @@
+import contextlib
+import cProfile
+import itertools
+import os
+import threading
+import time
+import tracemalloc
+
+import job_log
+
+KNOWN_MODES = ("cpu", "mem")
+
+
+def _parse_modes(value):
+    modes = {m.strip() for m in value.lower().split(",") if m.strip()}
+    unknown = modes.difference(KNOWN_MODES)
+    if unknown:
+        job_log.default_logger().warning(
+            "Ignoring unknown SCRAPER_PROFILE mode(s) %s; use %s",
+            ", ".join(sorted(unknown)), " or ".join(KNOWN_MODES),
+        )
+    return modes & set(KNOWN_MODES)
+
+
+# Opt-in: SCRAPER_PROFILE=cpu, mem or cpu,mem. Stats files land in SCRAPER_PROFILE_DIR.
+PROFILE_MODES = _parse_modes(os.getenv("SCRAPER_PROFILE", ""))
+PROFILE_DIR = os.getenv("SCRAPER_PROFILE_DIR", "profiles")
+
+# Allocation sites listed per stage in the tracemalloc report
+TOP_ALLOCATIONS = 25
+
+# Only one cProfile can be active per process (3.12+ raises otherwise), so
+# profiled stages from concurrent jobs run one at a time
+_profile_lock = threading.Lock()
+_local = threading.local()
+
+# Keeps stats files from stages profiled within the same second apart
+_sequence = itertools.count(1)
+
+
+def enabled():
+    return bool(PROFILE_MODES)
+
+
+def _stats_base(stage):
+    """Path prefix shared by one profiled run's .prof and .mem.txt files."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(PROFILE_DIR, f"{stage}-{stamp}-{os.getpid()}-{next(_sequence)}")
+
+
+@contextlib.contextmanager
+def profile_stage(stage):
+    """
+    Profile one pipeline stage when SCRAPER_PROFILE is set; a no-op otherwise.
+    cpu writes a cProfile .prof file (open with pstats or snakeviz), mem writes
+    the stage's top allocation sites and peak traced memory from tracemalloc.
+    Profiled stages are serialized across threads.
+    """
+    if not PROFILE_MODES or getattr(_local, "active", False):
+        # A stage nested in another profiled stage is already covered by the outer one
+        yield
+        return
+
+    with _profile_lock:
+        _local.active = True
+        try:
+            with _profiled(stage):
+                yield
+        finally:
+            _local.active = False
+
+
+@contextlib.contextmanager
+def _profiled(stage):
+    profiler = None
+    started_tracing = False
+    before = None
+    base = _stats_base(stage)
+
+    if "mem" in PROFILE_MODES:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+    if "cpu" in PROFILE_MODES:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(f"{base}.prof")
+
+        if before is not None:
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            diff = after.compare_to(before, "lineno")
+            with open(f"{base}.mem.txt", "w", encoding="utf-8") as f:
+                f.write(f"stage: {stage}\n")
+                f.write(f"peak traced memory: {peak / 1024:.1f} KiB\n\n")
+                for stat in diff[:TOP_ALLOCATIONS]:
+                    f.write(f"{stat}\n")
+            if started_tracing:
+                tracemalloc.stop()
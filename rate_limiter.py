@@ -0,0 +1,157 @@
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+# Token buckets live in SQLite so every thread and process on the machine
+# shares the same per-host budget.
+RATE_LIMIT_DB = os.getenv("RATE_LIMIT_DB", ".rate_limits.db")
+
+# Requests per second per host: start here, never drop below MIN_RATE or exceed MAX_RATE
+INITIAL_RATE = float(os.getenv("HOST_RATE", "1.0"))
+MIN_RATE = 0.05
+MAX_RATE = float(os.getenv("HOST_MAX_RATE", "4.0"))
+BURST = 3
+
+# AIMD: add a little after each success, halve on a throttling response
+INCREASE_STEP = 0.05
+DECREASE_FACTOR = 0.5
+THROTTLE_STATUSES = (403, 429, 503)
+
+# Longest pause a single throttling response can impose, whatever its Retry-After says
+MAX_PAUSE = float(os.getenv("HOST_MAX_PAUSE", "60"))
+
+STATS = {'acquired': 0, 'waited_seconds': 0.0, 'throttled': 0}
+_stats_lock = threading.Lock()
+_local = threading.local()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    host TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL,
+    rate REAL NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0
+)
+"""
+
+
+def _conn():
+    """One connection per thread; sqlite3 connections must not be shared across threads."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(RATE_LIMIT_DB, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def host_of(url):
+    return (urlparse(url).hostname or url).lower()
+
+
+def _load(conn, host, now):
+    row = conn.execute(
+        "SELECT tokens, updated, rate, blocked_until FROM buckets WHERE host = ?", (host,)
+    ).fetchone()
+    if row is None:
+        conn.execute(
+            "INSERT INTO buckets (host, tokens, updated, rate, blocked_until) VALUES (?, ?, ?, ?, 0)",
+            (host, BURST, now, INITIAL_RATE),
+        )
+        return float(BURST), now, INITIAL_RATE, 0.0
+    return row
+
+
+def acquire(url, timeout=None):
+    """
+    Block until the host of `url` has a token, then take it.
+    Returns the seconds spent waiting; raises TimeoutError if that would exceed `timeout`.
+    """
+    host = host_of(url)
+    conn = _conn()
+    waited = 0.0
+
+    while True:
+        # BEGIN IMMEDIATE takes the write lock up front, so refill-and-take is atomic across processes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            tokens, updated, rate, blocked_until = _load(conn, host, now)
+            tokens = min(BURST, tokens + max(0.0, now - updated) * rate)
+
+            if now >= blocked_until and tokens >= 1:
+                conn.execute("UPDATE buckets SET tokens = ?, updated = ? WHERE host = ?", (tokens - 1, now, host))
+                conn.execute("COMMIT")
+                with _stats_lock:
+                    STATS['acquired'] += 1
+                    STATS['waited_seconds'] += waited
+                return waited
+
+            conn.execute("UPDATE buckets SET tokens = ?, updated = ? WHERE host = ?", (tokens, now, host))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        wait = max(blocked_until - now, (1 - tokens) / rate, 0.01)
+        if timeout is not None and waited + wait > timeout:
+            raise TimeoutError(f"Rate limit for {host} not available within {timeout}s")
+        time.sleep(wait)
+        waited += wait
+
+
+def report(url, status_code, retry_after=None):
+    """
+    Feed a response back into the host's rate: a throttling status halves the
+    rate and pauses the host (for Retry-After, capped at MAX_PAUSE), anything
+    successful nudges the rate up.
+    """
+    if status_code is None:
+        return
+    host = host_of(url)
+    conn = _conn()
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        now = time.time()
+        tokens, updated, rate, blocked_until = _load(conn, host, now)
+
+        if status_code in THROTTLE_STATUSES:
+            rate = max(MIN_RATE, rate * DECREASE_FACTOR)
+            pause = min(MAX_PAUSE, _retry_after_seconds(retry_after) or 1.0 / rate)
+            conn.execute(
+                "UPDATE buckets SET tokens = 0, updated = ?, rate = ?, blocked_until = ? WHERE host = ?",
+                (now, rate, max(blocked_until, now + pause), host),
+            )
+            with _stats_lock:
+                STATS['throttled'] += 1
+        elif 200 <= status_code < 400:
+            conn.execute(
+                "UPDATE buckets SET rate = ? WHERE host = ?",
+                (min(MAX_RATE, rate + INCREASE_STEP), host),
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _retry_after_seconds(value):
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def current_rate(url):
+    """The host's current allowed requests per second."""
+    row = _conn().execute("SELECT rate FROM buckets WHERE host = ?", (host_of(url),)).fetchone()
+    return row[0] if row else INITIAL_RATE
+
+
+def get_stats():
+    with _stats_lock:
+        return dict(STATS)
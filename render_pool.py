@@ -0,0 +1,143 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pdf_cache
+from script import REPORT_CSS, TEMPLATE_VERSION, build_report_html, pdf_renderer
+
+# Per-worker WeasyPrint state, created once by _init_worker and reused for every job
+_FONT_CONFIG = None
+_STYLESHEETS = None
+
+
+def _init_worker():
+    """Load WeasyPrint, fonts and the parsed report stylesheet once per worker process."""
+    global _FONT_CONFIG, _STYLESHEETS
+    from weasyprint import CSS
+    try:
+        from weasyprint.text.fonts import FontConfiguration
+    except ImportError:
+        from weasyprint.fonts import FontConfiguration
+
+    _FONT_CONFIG = FontConfiguration()
+    _STYLESHEETS = [CSS(string=REPORT_CSS, font_config=_FONT_CONFIG)]
+
+
+def _render(html_content):
+    from weasyprint import HTML
+    return HTML(string=html_content).write_pdf(stylesheets=_STYLESHEETS, font_config=_FONT_CONFIG)
+
+
+class RenderPool:
+    """
+    Renders report HTML to PDF bytes across a pool of worker processes, so a
+    batch of scorecards uses every core instead of one GIL-bound thread.
+    """
+
+    def __init__(self, max_workers=None):
+        # Fail here with a clear message instead of a BrokenProcessPool from the worker initializer
+        if pdf_renderer() != "weasyprint":
+            raise RuntimeError(
+                "RenderPool needs WeasyPrint and its Pango libraries (pip install weasyprint); "
+                "use script.write_pdf to render with Chromium instead"
+            )
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # spawn avoids forking a process that may already be running Streamlit/Playwright threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def render_html(self, html_documents):
+        """Render HTML strings (built with inline_css=False) to PDF bytes, in order."""
+        html_documents = list(html_documents)
+        chunksize = max(1, len(html_documents) // (self.max_workers * 4))
+        return list(self._executor.map(_render, html_documents, chunksize=chunksize))
+
+    def render_packets(self, data_packets, use_cache=True):
+        """
+        Render get_match_data packets to PDF bytes, in order.
+        Shares cache keys with generate_pdf's WeasyPrint renders, so either path
+        can serve the other's; Chromium renders are keyed separately.
+        """
+        data_packets = list(data_packets)
+        results = [None] * len(data_packets)
+        pending = []
+
+        for i, packet in enumerate(data_packets):
+            key = None
+            if use_cache:
+                key = pdf_cache.cache_key(build_report_html(packet), TEMPLATE_VERSION, "weasyprint")
+                results[i] = pdf_cache.get(key)
+            if results[i] is None:
+                pending.append((i, key, build_report_html(packet, inline_css=False)))
+
+        rendered = self.render_html(html for _, _, html in pending)
+        for (i, key, _), pdf_bytes in zip(pending, rendered):
+            results[i] = pdf_bytes
+            if key is not None:
+                pdf_cache.put(key, pdf_bytes)
+
+        return results
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _sample_packet(seed):
+    batting = [
+        {'name': f"Batter {seed}-{i}", 'runs': (seed * 7 + i * 13) % 90, 'balls': 10 + i * 5, '4s': i, '6s': i % 3}
+        for i in range(11)
+    ]
+    bowling = [
+        {'name': f"Bowler {seed}-{i}", 'overs': "4.0", 'runs': 20 + i * 3, 'wickets': i % 4}
+        for i in range(6)
+    ]
+    inning = {'inning_start_time': "2024-01-01T10:00:00", 'summary': {'score': "150/6", 'over': "(20.0 Ov)"}}
+    return {
+        'scorecard': [
+            {'teamName': f"Team A{seed}", 'inning': inning, 'batting': batting, 'bowling': bowling},
+            {'teamName': f"Team B{seed}", 'inning': inning, 'batting': list(batting), 'bowling': list(bowling)},
+        ],
+        'meta': {'result': "Team A won by 10 runs", 'man_of_the_match': "Batter", 'match_overs': 20,
+                 'tournament_name': "Benchmark Cup"},
+    }
+
+
+def benchmark(n_documents=200, worker_counts=None):
+    """
+    Render the same synthetic batch with increasing worker counts and report
+    throughput, to check that rendering scales with cores. The cache is
+    bypassed so every run does the full layout work.
+    """
+    cpu_count = os.cpu_count() or 1
+    worker_counts = worker_counts or sorted({1, 2, 4, cpu_count} & set(range(1, cpu_count + 1)))
+    documents = [build_report_html(_sample_packet(i), inline_css=False) for i in range(n_documents)]
+
+    results = []
+    for workers in worker_counts:
+        with RenderPool(max_workers=workers) as pool:
+            # Warm every worker (font config, stylesheet) before timing
+            pool.render_html(documents[:workers])
+            start = time.perf_counter()
+            pool.render_html(documents)
+            elapsed = time.perf_counter() - start
+        results.append((workers, elapsed))
+
+    base = results[0][1]
+    print(f"{'workers':>8} {'seconds':>9} {'docs/s':>8} {'speedup':>8}")
+    for workers, elapsed in results:
+        print(f"{workers:>8} {elapsed:>9.2f} {n_documents / elapsed:>8.1f} {base / elapsed:>7.2f}x")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,98 @@
+import json
+import os
+import sys
+
+import job_log
+import match_cache
+import profiling
+
+# Set SCRAPER_RECORD_DIR to save a fixture bundle for every get_match_data call
+RECORD_DIR = os.getenv("SCRAPER_RECORD_DIR")
+
+# One file per stage input, plus the packet the live run produced for comparison
+RESOLVE_FILE = "resolve.html"
+SCORECARD_FILE = "scorecard.html"
+NEXT_DATA_FILE = "next_data.json"
+PACKET_FILE = "packet.json"
+MANIFEST_FILE = "manifest.json"
+
+
+def bundle_dir(record_dir, url):
+    """Bundle directory for a match inside a recording root."""
+    return os.path.join(record_dir, match_cache.match_key(url))
+
+
+def save(bundle, name, content):
+    os.makedirs(bundle, exist_ok=True)
+    path = os.path.join(bundle, name)
+    if isinstance(content, (dict, list)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(content, f, indent=1)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+
+def load(bundle, name):
+    path = os.path.join(bundle, name)
+    with open(path, "r", encoding="utf-8") as f:
+        if name.endswith(".json"):
+            return json.load(f)
+        return f.read()
+
+
+def replay_match_data(bundle, log=None):
+    """
+    Run the get_match_data pipeline from a recorded bundle with no network:
+    resolve the scorecard URL from resolve.html, extract __NEXT_DATA__ from
+    scorecard.html, and build the packet from the recorded next_data.json
+    (the extracted data when there is none). Each stage is profiled like a
+    live run.
+    """
+    from script import resolve_scorecard_url, extract_next_data, build_data_packet
+
+    log = log or job_log.default_logger()
+    manifest = load(bundle, MANIFEST_FILE)
+    log.info("Replaying %s", manifest['url'])
+
+    with profiling.profile_stage("resolve"):
+        real_url = resolve_scorecard_url(load(bundle, RESOLVE_FILE), log)
+    if real_url != manifest['real_url']:
+        log.warning("Resolved %s, recording had %s", real_url, manifest['real_url'])
+
+    content = load(bundle, SCORECARD_FILE)
+    with profiling.profile_stage("extract"):
+        data = extract_next_data(content, log)
+
+    # build_packet replays against exactly the input the live run saw
+    if os.path.exists(os.path.join(bundle, NEXT_DATA_FILE)):
+        recorded = load(bundle, NEXT_DATA_FILE)
+        if recorded != data:
+            log.warning("Extracted __NEXT_DATA__ differs from %s, building from the recording", NEXT_DATA_FILE)
+        data = recorded
+    with profiling.profile_stage("build_packet"):
+        data_packet = build_data_packet(data, log)
+
+    return data_packet
+
+
+def run():
+    if len(sys.argv) < 2:
+        print("Usage: python replay.py <bundle dir> [output pdf]")
+        return
+    from script import generate_pdf
+
+    bundle = sys.argv[1]
+    data_packet = replay_match_data(bundle)
+
+    expected_path = os.path.join(bundle, PACKET_FILE)
+    if os.path.exists(expected_path):
+        matches = load(bundle, PACKET_FILE) == data_packet
+        print(f"{'✓' if matches else '✗'} Replayed packet {'matches' if matches else 'differs from'} the recording")
+
+    if len(sys.argv) > 2:
+        generate_pdf(data_packet, sys.argv[2], use_cache=False)
+
+
+if __name__ == "__main__":
+    run()
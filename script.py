@@ -1,4 +1,3 @@
-from playwright.sync_api import sync_playwright
 from bs4 import BeautifulSoup
 import json
 import time
@@ -6,9 +5,61 @@ import os
 import requests
 from dotenv import load_dotenv
 
+import browser_supervisor
+import cookie_jar
+import http_client
+import job_log
+import pdf_cache
+import profiling
+import rate_limiter
+import replay
+
 # Load environment variables
 load_dotenv()
 
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+
+# Enhanced headers to look more like a real browser
+BROWSER_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": http_client.ACCEPT_ENCODING,
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-User": "?1",
+    "Cache-Control": "max-age=0",
+    "Referer": "https://www.google.com/",
+    "sec-ch-ua": '"Not A(Brand";v="99", "Google Chrome";v="121", "Chromium";v="121"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"Windows"'
+}
+
+SCRAPE_BROWSER_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-accelerated-2d-canvas',
+    '--no-first-run',
+    '--no-zygote',
+    '--single-process',  # Important for Streamlit Cloud
+    '--disable-gpu',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--disable-web-security'
+]
+
+PDF_BROWSER_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--single-process',
+    '--disable-gpu'
+]
+
 def apply_stealth(page):
     """
     Enhanced stealth scripts to bypass bot detection.
@@ -59,221 +110,245 @@ def apply_stealth(page):
         );
     """)
 
-def get_match_data(url):
-    import sys
-    
-    print(f"[DEBUG] Starting get_match_data for URL: {url}", file=sys.stderr)
-    
-    try:
-        r = requests.get(url, timeout=10)
-        print(f"[DEBUG] Initial request status: {r.status_code}", file=sys.stderr)
-    except Exception as e:
-        print(f"[DEBUG] Initial request failed: {e}", file=sys.stderr)
-        raise
-    
-    soup = BeautifulSoup(r.text, "html.parser")
+def new_stealth_page(supervisor):
+    """Open a browser context that looks like a regular desktop Chrome, with stealth scripts applied."""
+    context = supervisor.new_context(
+        viewport={'width': 1920, 'height': 1080},
+        user_agent=USER_AGENT,
+        locale='en-US',
+        timezone_id='America/New_York',
+        extra_http_headers={
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Sec-Fetch-Dest': 'document',
+            'Sec-Fetch-Mode': 'navigate',
+            'Sec-Fetch-Site': 'none'
+        }
+    )
+    page = supervisor.new_page(context)
+    apply_stealth(page)
+    return context, page
+
+def resolve_scorecard_url(html, log=None):
+    """Find the canonical scorecard URL in a match page's og:url tag."""
+    log = log or job_log.default_logger()
+    soup = BeautifulSoup(html, "html.parser")
     og_url = soup.find("meta", property="og:url")
     
     if not og_url:
-        print(f"[DEBUG] No og:url meta tag found", file=sys.stderr)
+        log.warning("No og:url meta tag found")
         raise Exception("Could not find match URL in page")
     
     real_url = og_url['content']
     real_url = str(real_url) + '/scorecard'
-    print(f"[DEBUG] Target scorecard URL: {real_url}", file=sys.stderr)
-
-    # Enhanced headers to look more like a real browser
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-        "Sec-Fetch-Dest": "document",
-        "Sec-Fetch-Mode": "navigate",
-        "Sec-Fetch-Site": "none",
-        "Sec-Fetch-User": "?1",
-        "Cache-Control": "max-age=0",
-        "Referer": "https://www.google.com/",
-        "sec-ch-ua": '"Not A(Brand";v="99", "Google Chrome";v="121", "Chromium";v="121"',
-        "sec-ch-ua-mobile": "?0",
-        "sec-ch-ua-platform": '"Windows"'
-    }
+    log.info("Target scorecard URL: %s", real_url)
+    return real_url
+
+def _rate_limited_error(url, wait_timeout):
+    return Exception(
+        f"Too many requests to {rate_limiter.host_of(url)} right now "
+        f"(no slot within {wait_timeout}s). Please try again in a minute."
+    )
+
+def fetch_scorecard(real_url, log=None, wait_timeout=None):
+    """
+    Fetch the scorecard page HTML: requests first, Playwright with stealth as fallback.
+    wait_timeout bounds each wait for the rate limiter; running out fails the fetch.
+    """
+    log = log or job_log.default_logger()
+    
+    # Copy so the jar's user agent can be swapped in for this request
+    headers = dict(BROWSER_HEADERS)
 
     content = None
+    reason = None
     
     # Try with requests first (fast path)
-    print("[DEBUG] Attempting to fetch with requests...", file=sys.stderr)
+    log.debug("Attempting to fetch with requests...")
     try:
         session = requests.Session()
-        # First request to get cookies
-        session.get("https://www.google.com/", timeout=10)
-        time.sleep(1)
         
-        r2 = session.get(real_url, headers=headers, timeout=15)
-        print(f"[DEBUG] Requests response status: {r2.status_code}", file=sys.stderr)
+        # Reuse clearance cookies from an earlier browser run if they are still valid
+        jar_user_agent = cookie_jar.apply_to_session(session)
+        if jar_user_agent:
+            log.debug("Loaded %s cookies from jar", len(session.cookies))
+            headers["User-Agent"] = jar_user_agent
+        else:
+            # First request to get cookies
+            try:
+                rate_limiter.acquire("https://www.google.com/", timeout=wait_timeout)
+                session.get("https://www.google.com/", timeout=10)
+                time.sleep(1)
+            except TimeoutError:
+                log.debug("Skipping Google warm-up, rate limited")
+        
+        content, status_code, reason = http_client.fetch_page(
+            session, real_url, headers, timeout=15, wait_timeout=wait_timeout
+        )
+        log.debug("Requests response status: %s", status_code)
         
-        if r2.status_code == 200 and "__NEXT_DATA__" in r2.text:
-            print("[DEBUG] ✓ Successfully fetched with requests!", file=sys.stderr)
-            content = r2.text
+        if content:
+            log.info("✓ Successfully fetched with requests!")
         else:
-            print(f"[DEBUG] ✗ Requests failed (Status: {r2.status_code}). Falling back to Playwright.", file=sys.stderr)
+            # Only a 403 or a challenge page means the clearance was rejected; 429/503 are plain throttling
+            if jar_user_agent and (status_code == 403 or reason == 'missing_next_data'):
+                log.info("Stored cookies were rejected, clearing jar")
+                cookie_jar.clear()
+            log.warning("✗ Requests failed (%s, Status: %s). Falling back to Playwright.", reason, status_code)
     except Exception as e:
-        print(f"[DEBUG] ✗ Requests error: {e}", file=sys.stderr)
+        log.warning("✗ Requests error: %s", e)
+
+    # The browser would wait on the same host's limiter, so don't fall back
+    if reason == 'rate_limited':
+        raise _rate_limited_error(real_url, wait_timeout)
 
     # Fallback to Playwright with enhanced stealth
     if not content:
-        print("[DEBUG] Launching browser with stealth mode...", file=sys.stderr)
+        log.info("Launching browser with stealth mode...")
+        from playwright.sync_api import sync_playwright
         
         with sync_playwright() as p:
             try:
-                print("[DEBUG] Starting Playwright browser launch...", file=sys.stderr)
-                browser = p.chromium.launch(
-                    headless=True,
-                    args=[
-                        '--no-sandbox',
-                        '--disable-setuid-sandbox',
-                        '--disable-dev-shm-usage',
-                        '--disable-accelerated-2d-canvas',
-                        '--no-first-run',
-                        '--no-zygote',
-                        '--single-process',  # Important for Streamlit Cloud
-                        '--disable-gpu',
-                        '--disable-blink-features=AutomationControlled',
-                        '--disable-features=IsolateOrigins,site-per-process',
-                        '--disable-web-security'
-                    ]
-                )
+                log.debug("Starting Playwright browser launch...")
+                with browser_supervisor.supervised_browser(p, SCRAPE_BROWSER_ARGS, log=log) as supervisor:
+                    log.debug("Browser launched, creating context...")
+                    context, page = new_stealth_page(supervisor)
+                    
+                    # Visit Google first to look more human-like
+                    log.debug("Visiting Google first...")
+                    try:
+                        rate_limiter.acquire("https://www.google.com/", timeout=wait_timeout)
+                        page.goto("https://www.google.com/", timeout=30000, wait_until="domcontentloaded")
+                        time.sleep(2)
+                        log.info("✓ Google visit successful")
+                    except Exception as e:
+                        log.warning("Could not visit Google: %s", e)
                 
-                print("[DEBUG] Browser launched, creating context...", file=sys.stderr)
-                context = browser.new_context(
-                    viewport={'width': 1920, 'height': 1080},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-                    locale='en-US',
-                    timezone_id='America/New_York',
-                    extra_http_headers={
-                        'Accept-Language': 'en-US,en;q=0.9',
-                        'Sec-Fetch-Dest': 'document',
-                        'Sec-Fetch-Mode': 'navigate',
-                        'Sec-Fetch-Site': 'none'
-                    }
-                )
+                    # Now visit the target page
+                    log.debug("Navigating to target page: %s", real_url)
                 
-                page = context.new_page()
-                apply_stealth(page)
+                    navigation_success = False
+                    for attempt in range(3):
+                        # A retry after a crash or memory blow-up gets a fresh browser
+                        if attempt > 0 and supervisor.check():
+                            context, page = new_stealth_page(supervisor)
+                        log.debug("Navigation attempt %s/3...", attempt + 1)
+                        # Outside the retry handler: retrying would only wait on the limiter again
+                        try:
+                            rate_limiter.acquire(real_url, timeout=wait_timeout)
+                        except TimeoutError:
+                            raise _rate_limited_error(real_url, wait_timeout)
+                        try:
+                            response = page.goto(real_url, timeout=60000, wait_until="domcontentloaded")
+                            if response is not None:
+                                rate_limiter.report(real_url, response.status, response.headers.get('retry-after'))
+                            log.info("✓ Page loaded (attempt %s)", attempt + 1)
+                            navigation_success = True
+                            break
+                        except Exception as e:
+                            log.warning("✗ Navigation attempt %s failed: %s", attempt + 1, e)
+                            if attempt < 2:
+                                time.sleep(3)
+                            else:
+                                raise Exception(f"Failed to load page after 3 attempts: {e}")
                 
-                # Visit Google first to look more human-like
-                print("[DEBUG] Visiting Google first...", file=sys.stderr)
-                try:
-                    page.goto("https://www.google.com/", timeout=30000, wait_until="domcontentloaded")
-                    time.sleep(2)
-                    print("[DEBUG] ✓ Google visit successful", file=sys.stderr)
-                except Exception as e:
-                    print(f"[DEBUG] Warning: Could not visit Google: {e}", file=sys.stderr)
+                    if not navigation_success:
+                        raise Exception("Failed to navigate to target page")
                 
-                # Now visit the target page
-                print(f"[DEBUG] Navigating to target page: {real_url}", file=sys.stderr)
+                    # Wait for Cloudflare to finish
+                    log.debug("Waiting for Cloudflare check (5s)...")
+                    time.sleep(5)
                 
-                navigation_success = False
-                for attempt in range(3):
+                    # Try to detect Cloudflare challenge
+                    log.debug("Checking for Cloudflare challenge...")
                     try:
-                        print(f"[DEBUG] Navigation attempt {attempt + 1}/3...", file=sys.stderr)
-                        page.goto(real_url, timeout=60000, wait_until="domcontentloaded")
-                        print(f"[DEBUG] ✓ Page loaded (attempt {attempt + 1})", file=sys.stderr)
-                        navigation_success = True
-                        break
-                    except Exception as e:
-                        print(f"[DEBUG] ✗ Navigation attempt {attempt + 1} failed: {e}", file=sys.stderr)
-                        if attempt < 2:
-                            time.sleep(3)
-                        else:
-                            raise Exception(f"Failed to load page after 3 attempts: {e}")
-                
-                if not navigation_success:
-                    raise Exception("Failed to navigate to target page")
-                
-                # Wait for Cloudflare to finish
-                print("[DEBUG] Waiting for Cloudflare check (5s)...", file=sys.stderr)
-                time.sleep(5)
-                
-                # Try to detect Cloudflare challenge
-                print("[DEBUG] Checking for Cloudflare challenge...", file=sys.stderr)
-                try:
-                    page.wait_for_selector("body", timeout=10000)
-                    page_text = page.content()
+                        page.wait_for_selector("body", timeout=10000)
+                        page_text = page.content()
                     
-                    if "Cloudflare" in page_text and "challenge" in page_text.lower():
-                        print("[DEBUG] ⚠️ Cloudflare challenge detected. Waiting longer...", file=sys.stderr)
-                        time.sleep(10)
-                    else:
-                        print("[DEBUG] ✓ No Cloudflare challenge detected", file=sys.stderr)
-                except Exception as e:
-                    print(f"[DEBUG] Error checking for Cloudflare: {e}", file=sys.stderr)
+                        if "Cloudflare" in page_text and "challenge" in page_text.lower():
+                            log.warning("⚠️ Cloudflare challenge detected. Waiting longer...")
+                            time.sleep(10)
+                        else:
+                            log.info("✓ No Cloudflare challenge detected")
+                    except Exception as e:
+                        log.warning("Error checking for Cloudflare: %s", e)
                 
-                # Wait for the data
-                print("[DEBUG] Waiting for __NEXT_DATA__...", file=sys.stderr)
-                try:
-                    page.wait_for_selector("script[id='__NEXT_DATA__']", timeout=30000)
-                    print("[DEBUG] ✓ __NEXT_DATA__ found!", file=sys.stderr)
-                except Exception as e:
-                    print(f"[DEBUG] ✗ __NEXT_DATA__ not found: {e}", file=sys.stderr)
-                    # Take screenshot for debugging
+                    # Wait for the data
+                    log.debug("Waiting for __NEXT_DATA__...")
                     try:
-                        screenshot_path = "debug_screenshot.png"
-                        page.screenshot(path=screenshot_path)
-                        print(f"[DEBUG] Debug screenshot saved as {screenshot_path}", file=sys.stderr)
-                    except:
-                        pass
+                        page.wait_for_selector("script[id='__NEXT_DATA__']", timeout=30000)
+                        log.info("✓ __NEXT_DATA__ found!")
+                    except Exception as e:
+                        log.warning("✗ __NEXT_DATA__ not found: %s", e)
+                        # Take screenshot for debugging
+                        try:
+                            screenshot_path = "debug_screenshot.png"
+                            page.screenshot(path=screenshot_path)
+                            log.debug("Debug screenshot saved as %s", screenshot_path)
+                        except:
+                            pass
                     
-                    # Save page content
-                    try:
-                        page_content = page.content()
-                        if "cloudflare" in page_content.lower():
-                            raise Exception("Blocked by Cloudflare. The site is detecting automated access from Streamlit Cloud servers.")
-                        else:
-                            raise Exception("Could not find match data. The page structure may have changed.")
-                    except Exception as inner_e:
-                        raise inner_e
+                        # Save page content
+                        try:
+                            page_content = page.content()
+                            if "cloudflare" in page_content.lower():
+                                raise Exception("Blocked by Cloudflare. The site is detecting automated access from Streamlit Cloud servers.")
+                            else:
+                                raise Exception("Could not find match data. The page structure may have changed.")
+                        except Exception as inner_e:
+                            raise inner_e
+                
+                    content = page.content()
+                    log.info("✓ Content retrieved: %s characters", len(content))
                 
-                content = page.content()
-                print(f"[DEBUG] ✓ Content retrieved: {len(content)} characters", file=sys.stderr)
+                    # Keep the clearance cookies for the fast path before the context goes away
+                    try:
+                        saved = cookie_jar.save_storage_state(context.storage_state(), USER_AGENT)
+                        log.debug("Saved %s cookies to jar", saved)
+                    except Exception as e:
+                        log.warning("Could not save cookies: %s", e)
                 
-                context.close()
-                browser.close()
-                print("[DEBUG] Browser closed", file=sys.stderr)
+                    context.close()
+                    log.debug("Browser metrics: %s", browser_supervisor.get_metrics())
+                log.debug("Browser closed")
                 
             except Exception as e:
-                print(f"[DEBUG] ✗ Playwright error: {e}", file=sys.stderr)
-                import traceback
-                traceback.print_exc()
+                log.error("✗ Playwright error: %s", e, exc_info=True)
                 raise Exception(f"Failed to load page with Playwright: {e}")
 
     if not content:
         raise Exception("Failed to fetch content with both methods")
 
-    print("[DEBUG] Parsing HTML content...", file=sys.stderr)
+    return content
+
+def extract_next_data(content, log=None):
+    """Pull the parsed __NEXT_DATA__ JSON out of the scorecard page."""
+    log = log or job_log.default_logger()
+    log.debug("Parsing HTML content...")
     # Parse the content
     soup = BeautifulSoup(content, 'html.parser')
     next_data_script = soup.find('script', id='__NEXT_DATA__')
     
     if not next_data_script:
         page_title = soup.title.string if soup.title else "No Title"
-        print(f"[DEBUG] ✗ Could not find __NEXT_DATA__. Page title: {page_title}", file=sys.stderr)
+        log.warning("✗ Could not find __NEXT_DATA__. Page title: %s", page_title)
         
         # Save HTML for debugging
         try:
             with open("debug_page.html", "w", encoding="utf-8") as f:
                 f.write(soup.prettify()[:5000])
-            print("[DEBUG] Debug HTML saved (first 5000 chars)", file=sys.stderr)
+            log.debug("Debug HTML saved (first 5000 chars)")
         except:
             pass
         
         raise Exception(f"Could not find match data in page. Title: {page_title}")
 
-    print("[DEBUG] Parsing JSON data...", file=sys.stderr)
+    log.debug("Parsing JSON data...")
     data = json.loads(next_data_script.string)
+    return data
 
+def build_data_packet(data, log=None):
+    """Reduce __NEXT_DATA__ to the scorecard and meta info the reports use."""
+    log = log or job_log.default_logger()
     try:
         props = data.get('props', {})
         page_props = props.get('pageProps', {})
@@ -288,17 +363,275 @@ def get_match_data(url):
             'tournament_name': summary_data.get('tournament_name', 'N/A')
         }
         
-        print(f"[DEBUG] ✓ Data extracted successfully. Scorecard length: {len(scorecard)}", file=sys.stderr)
+        log.info("✓ Data extracted successfully. Scorecard length: %s", len(scorecard))
 
     except Exception as e:
-        print(f"[DEBUG] ✗ Meta extraction error: {e}", file=sys.stderr)
+        log.warning("✗ Meta extraction error: %s", e)
         scorecard = []
         meta_info = {}
 
     return {'scorecard': scorecard, 'meta': meta_info}
 
+def _record_fixture(bundle, name, content, log):
+    try:
+        replay.save(bundle, name, content)
+    except Exception as e:
+        log.warning("Could not record %s: %s", name, e)
+
+def get_match_data(url, log=None, record_dir=None, wait_timeout=None):
+    """
+    Scrape a CricHeroes match into a data packet: resolve the scorecard URL,
+    fetch the page, extract __NEXT_DATA__ and build the packet. Each stage is
+    profiled when SCRAPER_PROFILE is set; with record_dir (or
+    SCRAPER_RECORD_DIR) every stage's input is saved as a replay bundle.
+    Interactive callers pass wait_timeout so a throttled host fails the job
+    instead of blocking it; background jobs may wait as long as it takes.
+    """
+    log = log or job_log.default_logger()
+    record_dir = record_dir or replay.RECORD_DIR
+    bundle = replay.bundle_dir(record_dir, url) if record_dir else None
+    
+    log.info("Starting get_match_data for URL: %s", url)
+    
+    with profiling.profile_stage("resolve"):
+        try:
+            waited = rate_limiter.acquire(url, timeout=wait_timeout)
+            if waited:
+                log.debug("Rate limiter held request for %.1fs", waited)
+            r = requests.get(url, timeout=10)
+            rate_limiter.report(url, r.status_code, r.headers.get('Retry-After'))
+            log.debug("Initial request status: %s", r.status_code)
+        except TimeoutError:
+            log.warning("Rate limiter had no slot within %ss", wait_timeout)
+            raise _rate_limited_error(url, wait_timeout)
+        except Exception as e:
+            log.warning("Initial request failed: %s", e)
+            raise
+        
+        real_url = resolve_scorecard_url(r.text, log)
+    
+    # Inputs are recorded as soon as they exist, so a failing later stage still leaves a fixture
+    if bundle:
+        _record_fixture(bundle, replay.MANIFEST_FILE, {'url': url, 'real_url': real_url, 'recorded_at': time.time()}, log)
+        _record_fixture(bundle, replay.RESOLVE_FILE, r.text, log)
+    
+    with profiling.profile_stage("fetch"):
+        content = fetch_scorecard(real_url, log, wait_timeout=wait_timeout)
+    if bundle:
+        _record_fixture(bundle, replay.SCORECARD_FILE, content, log)
+    
+    with profiling.profile_stage("extract"):
+        data = extract_next_data(content, log)
+    if bundle:
+        _record_fixture(bundle, replay.NEXT_DATA_FILE, data, log)
+    
+    with profiling.profile_stage("build_packet"):
+        data_packet = build_data_packet(data, log)
+    if bundle:
+        _record_fixture(bundle, replay.PACKET_FILE, data_packet, log)
+        log.info("✓ Recorded fixture bundle to %s", bundle)
+    
+    return data_packet
+
+
+# Longest the Streamlit app waits for the per-host rate limiter before failing the job
+INTERACTIVE_WAIT_TIMEOUT = 30
+
+# Bump whenever the report template or renderer settings change, so cached
+# PDFs from the old layout are no longer served
+TEMPLATE_VERSION = "1"
+
+# Shared print styling for every PDF report (scorecards and leaderboards)
+REPORT_CSS = """
+@import url('https://fonts.googleapis.com/css2?family=Roboto:wght@400;500;700;900&display=swap');
+@page {
+    size: A4;
+    margin: 0;
+}
+body {
+    font-family: 'Roboto', sans-serif;
+    margin: 0;
+    padding: 20px 30px;
+    color: #111;
+    background-color: #fff;
+    box-sizing: border-box;
+}
+.container {
+    max-width: 100%;
+    margin: 0 auto;
+}
+.header {
+    text-align: center;
+    margin-bottom: 10px;
+    text-transform: uppercase;
+    border-bottom: 3px solid #000;
+    padding-bottom: 10px;
+}
+.header h1 { margin: 0 0 5px 0; font-size: 24px; font-weight: 900; letter-spacing: 1px; }
+.header h2 { margin: 0; font-size: 16px; font-weight: 500; color: #333; }
+
+.meta-section {
+    display: flex;
+    justify-content: space-between;
+    font-size: 14px;
+    font-weight: 700;
+    margin-bottom: 15px;
+    padding: 10px;
+    background-color: #f4f4f4;
+    border: 2px solid #000;
+}
+
+.match-title {
+    text-align: center;
+    font-size: 18px;
+    font-weight: 900;
+    margin: 15px 0;
+    padding: 10px;
+    border: 2px solid #000;
+    background-color: #fff;
+    box-shadow: 3px 3px 0px #000;
+}
+
+.inning-section {
+    margin-bottom: 20px;
+}
+
+.inning-header {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    padding: 8px 12px;
+    background: #000;
+    color: #fff;
+    font-size: 16px;
+    font-weight: 900;
+    margin-bottom: 0; 
+    border: 2px solid #000;
+}
 
-def generate_pdf(data_packet, output_file="scorecard.pdf"):
+table {
+    width: 100%;
+    border-collapse: collapse;
+    margin-bottom: 15px;
+}
+
+th {
+    background-color: #e0e0e0;
+    color: #000;
+    padding: 6px;
+    text-align: center;
+    font-weight: 800;
+    font-size: 12px;
+    text-transform: uppercase;
+    border: 2px solid #000;
+}
+
+td {
+    padding: 6px;
+    text-align: center;
+    border: 2px solid #000;
+    font-size: 14px;
+    font-weight: 700;
+}
+
+.col-no { width: 40px; color: #444; font-size: 12px; }
+.col-name { 
+    text-align: left; 
+    padding-left: 10px; 
+    font-size: 14px; 
+    font-weight: 800;
+    width: 45%;
+}
+
+.bowling-header {
+    font-size: 14px;
+    font-weight: 900;
+    margin: 15px 0 5px 0;
+    text-transform: uppercase;
+    padding-left: 10px;
+    border-left: 5px solid #000;
+    line-height: 1;
+}
+
+.footer {
+    margin-top: 20px;
+    padding-top: 15px;
+}
+
+.footer-row {
+    font-size: 14px;
+    font-weight: 900;
+    margin-bottom: 10px;
+    padding: 10px;
+    background: #f4f4f4;
+    border: 2px solid #000;
+}
+
+.label {
+    font-weight: 700;
+    color: #555;
+    margin-right: 10px;
+}
+"""
+
+
+def pdf_renderer():
+    """
+    The renderer write_pdf will use: "weasyprint" when it imports (it also
+    needs the Pango system libraries), "chromium" otherwise.
+    """
+    try:
+        import weasyprint  # noqa: F401
+        return "weasyprint"
+    except (ImportError, OSError):
+        return "chromium"
+
+
+def write_pdf(html_content, output_file, log=None):
+    """
+    Render report HTML to a PDF file, preferring WeasyPrint and falling back
+    to headless Chromium. Returns the name of the renderer that was used.
+    """
+    log = log or job_log.default_logger()
+    log.info("Generating PDF from HTML...")
+    try:
+        # Try using weasyprint first (more reliable on cloud)
+        renderer = pdf_renderer()
+        if renderer == "weasyprint":
+            from weasyprint import HTML
+            log.debug("Using WeasyPrint for PDF generation...")
+            HTML(string=html_content).write_pdf(output_file)
+            log.info("✓ PDF saved to %s", output_file)
+            return renderer
+        log.debug("WeasyPrint not available, using Playwright...")
+        
+        # Fallback to Playwright
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as p:
+            with browser_supervisor.supervised_browser(p, PDF_BROWSER_ARGS, log=log) as supervisor:
+                page = supervisor.new_page()
+                page.set_content(html_content, wait_until="networkidle")
+                page.pdf(
+                    path=output_file, 
+                    format="A4", 
+                    print_background=True, 
+                    margin={"top": "0.5cm", "right": "0.5cm", "bottom": "0.5cm", "left": "0.5cm"}
+                )
+        
+        log.info("✓ PDF saved to %s", output_file)
+        return renderer
+    except Exception as e:
+        log.error("✗ PDF generation error: %s", e, exc_info=True)
+        raise
+
+
+def build_report_html(data_packet, inline_css=True):
+    """
+    Render a data packet to the scorecard report HTML (does not modify the packet).
+    With inline_css=False the <style> block is left empty so a renderer can
+    apply REPORT_CSS as a pre-parsed stylesheet instead.
+    """
+    report_css = REPORT_CSS if inline_css else ""
     match_data = data_packet.get('scorecard', [])
     meta_info = data_packet.get('meta', {})
     
@@ -330,135 +663,7 @@ def generate_pdf(data_packet, output_file="scorecard.pdf"):
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Official Match Report</title>
         <style>
-            @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@400;500;700;900&display=swap');
-            @page {{
-                size: A4;
-                margin: 0;
-            }}
-            body {{
-                font-family: 'Roboto', sans-serif;
-                margin: 0;
-                padding: 20px 30px;
-                color: #111;
-                background-color: #fff;
-                box-sizing: border-box;
-            }}
-            .container {{
-                max-width: 100%;
-                margin: 0 auto;
-            }}
-            .header {{
-                text-align: center;
-                margin-bottom: 10px;
-                text-transform: uppercase;
-                border-bottom: 3px solid #000;
-                padding-bottom: 10px;
-            }}
-            .header h1 {{ margin: 0 0 5px 0; font-size: 24px; font-weight: 900; letter-spacing: 1px; }}
-            .header h2 {{ margin: 0; font-size: 16px; font-weight: 500; color: #333; }}
-            
-            .meta-section {{
-                display: flex;
-                justify-content: space-between;
-                font-size: 14px;
-                font-weight: 700;
-                margin-bottom: 15px;
-                padding: 10px;
-                background-color: #f4f4f4;
-                border: 2px solid #000;
-            }}
-            
-            .match-title {{
-                text-align: center;
-                font-size: 18px;
-                font-weight: 900;
-                margin: 15px 0;
-                padding: 10px;
-                border: 2px solid #000;
-                background-color: #fff;
-                box-shadow: 3px 3px 0px #000;
-            }}
-            
-            .inning-section {{
-                margin-bottom: 20px;
-            }}
-            
-            .inning-header {{
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                padding: 8px 12px;
-                background: #000;
-                color: #fff;
-                font-size: 16px;
-                font-weight: 900;
-                margin-bottom: 0; 
-                border: 2px solid #000;
-            }}
-            
-            table {{
-                width: 100%;
-                border-collapse: collapse;
-                margin-bottom: 15px;
-            }}
-            
-            th {{
-                background-color: #e0e0e0;
-                color: #000;
-                padding: 6px;
-                text-align: center;
-                font-weight: 800;
-                font-size: 12px;
-                text-transform: uppercase;
-                border: 2px solid #000;
-            }}
-            
-            td {{
-                padding: 6px;
-                text-align: center;
-                border: 2px solid #000;
-                font-size: 14px;
-                font-weight: 700;
-            }}
-            
-            .col-no {{ width: 40px; color: #444; font-size: 12px; }}
-            .col-name {{ 
-                text-align: left; 
-                padding-left: 10px; 
-                font-size: 14px; 
-                font-weight: 800;
-                width: 45%;
-            }}
-            
-            .bowling-header {{
-                font-size: 14px;
-                font-weight: 900;
-                margin: 15px 0 5px 0;
-                text-transform: uppercase;
-                padding-left: 10px;
-                border-left: 5px solid #000;
-                line-height: 1;
-            }}
-            
-            .footer {{
-                margin-top: 20px;
-                padding-top: 15px;
-            }}
-            
-            .footer-row {{
-                font-size: 14px;
-                font-weight: 900;
-                margin-bottom: 10px;
-                padding: 10px;
-                background: #f4f4f4;
-                border: 2px solid #000;
-            }}
-            
-            .label {{
-                font-weight: 700;
-                color: #555;
-                margin-right: 10px;
-            }}
+            {report_css}
         </style>
     </head>
     <body>
@@ -489,13 +694,11 @@ def generate_pdf(data_packet, output_file="scorecard.pdf"):
         opponent_name = match_data[opponent_index].get('teamName', 'Opponent') if len(match_data) > 1 else "Opponent"
 
         # Batting Processing (Top 3)
-        batters = inning.get('batting', [])
-        batters.sort(key=lambda x: int(x.get('runs', 0)), reverse=True)
+        batters = sorted(inning.get('batting', []), key=lambda x: int(x.get('runs', 0)), reverse=True)
         top_batters = batters[:3]
 
         # Bowling Processing (Top 3)
-        bowlers = inning.get('bowling', [])
-        bowlers.sort(key=lambda x: (int(x.get('wickets', 0)), -int(x.get('runs', 0))), reverse=True)
+        bowlers = sorted(inning.get('bowling', []), key=lambda x: (int(x.get('wickets', 0)), -int(x.get('runs', 0))), reverse=True)
         top_bowlers = bowlers[:3]
 
         html_content += f"""
@@ -609,46 +812,39 @@ def generate_pdf(data_packet, output_file="scorecard.pdf"):
     </html>
     """
     
-    print("Generating PDF from HTML...")
+    return html_content
+
+
+def generate_pdf(data_packet, output_file="scorecard.pdf", log=None, use_cache=True):
+    log = log or job_log.default_logger()
+    with profiling.profile_stage("build_html"):
+        html_content = build_report_html(data_packet)
+    
+    if not use_cache:
+        with profiling.profile_stage("render_pdf"):
+            write_pdf(html_content, output_file, log=log)
+        return
+    
+    # Identical HTML renders to an identical PDF, so serve repeats from the cache
+    key = pdf_cache.cache_key(html_content, TEMPLATE_VERSION, pdf_renderer())
+    pdf_bytes = pdf_cache.get(key)
+    if pdf_bytes is not None:
+        with open(output_file, "wb") as f:
+            f.write(pdf_bytes)
+        log.info("✓ PDF served from cache (%s bytes)", len(pdf_bytes))
+        return
+    
+    with profiling.profile_stage("render_pdf"):
+        renderer = write_pdf(html_content, output_file, log=log)
     try:
-        # Try using weasyprint first (more reliable on cloud)
-        try:
-            from weasyprint import HTML
-            print("Using WeasyPrint for PDF generation...")
-            HTML(string=html_content).write_pdf(output_file)
-            print(f"✓ PDF saved to {output_file}")
-            return
-        except ImportError:
-            print("WeasyPrint not available, using Playwright...")
-        
-        # Fallback to Playwright
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=True,
-                args=[
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--single-process',
-                    '--disable-gpu'
-                ]
-            )
-            page = browser.new_page()
-            page.set_content(html_content, wait_until="networkidle")
-            page.pdf(
-                path=output_file, 
-                format="A4", 
-                print_background=True, 
-                margin={"top": "0.5cm", "right": "0.5cm", "bottom": "0.5cm", "left": "0.5cm"}
-            )
-            browser.close()
-        
-        print(f"✓ PDF saved to {output_file}")
+        with open(output_file, "rb") as f:
+            pdf_cache.put(pdf_cache.cache_key(html_content, TEMPLATE_VERSION, renderer), f.read())
     except Exception as e:
-        print(f"✗ PDF generation error: {e}")
-        import traceback
-        traceback.print_exc()
-        raise
+        log.warning("Could not cache PDF: %s", e)
+    
+    stats = pdf_cache.cache_stats()
+    log.debug("PDF cache hit rate: %.0f%% (%s hits, %s misses)", stats['hit_rate'] * 100, stats['hits'], stats['misses'])
+
 
 def run():
     url = os.getenv("MATCH_URL")
@@ -0,0 +1,323 @@
+import html
+
+import numpy as np
+
+import job_log
+from match_store import fielding_team
+from script import REPORT_CSS, write_pdf
+
+# Minimum appearances before a player qualifies for the rate-based columns
+MIN_BATTING_INNINGS = 1
+MIN_BOWLING_BALLS = 6
+
+
+def _int_column(values):
+    """Convert raw JSON values (ints, numeric strings, None, '-') to int64 in one pass."""
+    text = np.asarray([str(v) if v is not None else '' for v in values], dtype=str)
+    if text.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    text = np.char.strip(text)
+    return np.where(np.char.isdigit(text), text, '0').astype(np.int64)
+
+
+def _balls_column(overs):
+    """Overs notation ("3.4" = 3 overs 4 balls) to legal balls, vectorised."""
+    text = np.asarray([str(v) if v is not None else '' for v in overs], dtype=str)
+    if text.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    parts = np.char.partition(text, '.')
+    return _int_column(parts[:, 0]) * 6 + _int_column(parts[:, 2])
+
+
+# Dismissal texts that do not cost the batter their wicket ("retired out" does)
+NOT_OUT_MARKERS = ("not out", "retired hurt", "did not bat")
+
+
+def _is_out(row):
+    """True only when the row records a dismissal; a missing field counts as not out."""
+    dismissal = str(row.get('how_to_out') or row.get('out_type') or '').strip().lower()
+    if not dismissal:
+        return False
+    return not any(marker in dismissal for marker in NOT_OUT_MARKERS)
+
+
+def load_columns(data_packets, tournament=None):
+    """
+    Flatten the batting/bowling rows of many get_match_data packets into
+    columnar NumPy arrays. This is the only per-row Python loop; everything
+    after it is vectorised.
+    """
+    bat = {'name': [], 'team': [], 'match': [], 'runs': [], 'balls': [], 'fours': [], 'sixes': [], 'out': []}
+    bowl = {'name': [], 'team': [], 'match': [], 'overs': [], 'runs': [], 'wickets': []}
+
+    for match_idx, packet in enumerate(data_packets):
+        if tournament is not None and packet.get('meta', {}).get('tournament_name') != tournament:
+            continue
+        match_data = packet.get('scorecard', [])
+        for i, inning in enumerate(match_data):
+            team = inning.get('teamName', 'Unknown')
+            opponent = fielding_team(match_data, i)
+            for b in inning.get('batting', []):
+                bat['name'].append(b.get('name', ''))
+                bat['team'].append(team)
+                bat['match'].append(match_idx)
+                bat['runs'].append(b.get('runs'))
+                bat['balls'].append(b.get('balls'))
+                bat['fours'].append(b.get('4s'))
+                bat['sixes'].append(b.get('6s'))
+                bat['out'].append(_is_out(b))
+            for b in inning.get('bowling', []):
+                bowl['name'].append(b.get('name', ''))
+                bowl['team'].append(opponent)
+                bowl['match'].append(match_idx)
+                bowl['overs'].append(b.get('overs'))
+                bowl['runs'].append(b.get('runs'))
+                bowl['wickets'].append(b.get('wickets'))
+
+    batting = {
+        'name': np.asarray(bat['name'], dtype=str),
+        'team': np.asarray(bat['team'], dtype=str),
+        'match': np.asarray(bat['match'], dtype=np.int64),
+        'runs': _int_column(bat['runs']),
+        'balls': _int_column(bat['balls']),
+        'fours': _int_column(bat['fours']),
+        'sixes': _int_column(bat['sixes']),
+        'out': np.asarray(bat['out'], dtype=bool),
+    }
+    bowling = {
+        'name': np.asarray(bowl['name'], dtype=str),
+        'team': np.asarray(bowl['team'], dtype=str),
+        'match': np.asarray(bowl['match'], dtype=np.int64),
+        'balls': _balls_column(bowl['overs']),
+        'runs': _int_column(bowl['runs']),
+        'wickets': _int_column(bowl['wickets']),
+    }
+    return batting, bowling
+
+
+def _ratio(numerator, denominator, scale=1.0):
+    """Element-wise numerator/denominator*scale with NaN where the denominator is 0."""
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator * scale, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def _matches_per_player(codes, matches, n):
+    if codes.size == 0:
+        return np.zeros(n, dtype=np.int64)
+    pairs = np.unique(codes * (matches.max() + 1) + matches)
+    return np.bincount(pairs // (matches.max() + 1), minlength=n)
+
+
+def _player_codes(columns):
+    """
+    Group rows by (name, team), like match_store does, so two players who
+    share a name on different teams stay apart. Returns (names, teams, codes).
+    """
+    keys = np.char.add(np.char.add(columns['name'], '\x00'), columns['team'])
+    _, first, codes = np.unique(keys, return_index=True, return_inverse=True)
+    return columns['name'][first], columns['team'][first], codes.reshape(-1)
+
+
+def batting_totals(batting):
+    """Per-player batting aggregates as arrays keyed by column name."""
+    names, teams, codes = _player_codes(batting)
+    n = names.size
+
+    runs = np.bincount(codes, weights=batting['runs'], minlength=n).astype(np.int64)
+    balls = np.bincount(codes, weights=batting['balls'], minlength=n).astype(np.int64)
+    outs = np.bincount(codes, weights=batting['out'], minlength=n).astype(np.int64)
+    highest = np.zeros(n, dtype=np.int64)
+    np.maximum.at(highest, codes, batting['runs'])
+
+    return {
+        'name': names,
+        'team': teams,
+        'matches': _matches_per_player(codes, batting['match'], n),
+        'innings': np.bincount(codes, minlength=n),
+        'runs': runs,
+        'balls': balls,
+        'outs': outs,
+        'fours': np.bincount(codes, weights=batting['fours'], minlength=n).astype(np.int64),
+        'sixes': np.bincount(codes, weights=batting['sixes'], minlength=n).astype(np.int64),
+        'highest': highest,
+        'average': _ratio(runs, outs),
+        'strike_rate': _ratio(runs, balls, 100.0),
+    }
+
+
+def bowling_totals(bowling):
+    """Per-player bowling aggregates, including best single-innings figures."""
+    names, teams, codes = _player_codes(bowling)
+    n = names.size
+
+    wickets = np.bincount(codes, weights=bowling['wickets'], minlength=n).astype(np.int64)
+    runs = np.bincount(codes, weights=bowling['runs'], minlength=n).astype(np.int64)
+    balls = np.bincount(codes, weights=bowling['balls'], minlength=n).astype(np.int64)
+
+    # Best figures: most wickets, then fewest runs, per player
+    order = np.lexsort((bowling['runs'], -bowling['wickets'], codes))
+    _, first = np.unique(codes[order], return_index=True)
+    best = order[first]
+
+    return {
+        'name': names,
+        'team': teams,
+        'matches': _matches_per_player(codes, bowling['match'], n),
+        'innings': np.bincount(codes, minlength=n),
+        'wickets': wickets,
+        'runs': runs,
+        'balls': balls,
+        'best_wickets': bowling['wickets'][best] if n else np.zeros(0, dtype=np.int64),
+        'best_runs': bowling['runs'][best] if n else np.zeros(0, dtype=np.int64),
+        'average': _ratio(runs, wickets),
+        'economy': _ratio(runs, balls, 6.0),
+        'strike_rate': _ratio(balls, wickets),
+    }
+
+
+def _top(totals, order, limit):
+    """Materialise only the top rows of a leaderboard as dicts."""
+    rows = []
+    for i in order[:limit]:
+        rows.append({key: column[i].item() for key, column in totals.items()})
+    return rows
+
+
+def batting_leaderboard(totals, limit=10, min_innings=MIN_BATTING_INNINGS):
+    """Top run scorers; ties broken by strike rate."""
+    eligible = np.flatnonzero(totals['innings'] >= min_innings)
+    strike_rate = np.nan_to_num(totals['strike_rate'][eligible])
+    order = eligible[np.lexsort((-strike_rate, -totals['runs'][eligible]))]
+    return _top(totals, order, limit)
+
+
+def bowling_leaderboard(totals, limit=10, min_balls=MIN_BOWLING_BALLS):
+    """Top wicket takers; ties broken by economy."""
+    eligible = np.flatnonzero(totals['balls'] >= min_balls)
+    economy = np.nan_to_num(totals['economy'][eligible], nan=np.inf)
+    order = eligible[np.lexsort((economy, -totals['wickets'][eligible]))]
+    return _top(totals, order, limit)
+
+
+def _fmt(value, digits=2):
+    if isinstance(value, float):
+        return "-" if np.isnan(value) else f"{value:.{digits}f}"
+    return value
+
+
+def _overs(balls):
+    return f"{balls // 6}.{balls % 6}"
+
+
+def build_leaderboard_html(batting_rows, bowling_rows, title="Season Leaderboard"):
+    """Leaderboard report HTML using the same styling as the match scorecard."""
+    title = html.escape(title)
+    html_content = f"""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <title>{title}</title>
+        <style>
+            {REPORT_CSS}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>Season Leaderboard</h1>
+                <h2>{title}</h2>
+            </div>
+
+            <div class="inning-section">
+                <div class="inning-header">
+                    <span>Top Run Scorers</span>
+                </div>
+                <table>
+                    <thead>
+                        <tr>
+                            <th class="col-no">No</th>
+                            <th class="col-name">BATSMAN</th>
+                            <th>INNS</th>
+                            <th>RUNS</th>
+                            <th>HS</th>
+                            <th>AVG</th>
+                            <th>SR</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+    """
+    for idx, row in enumerate(batting_rows):
+        html_content += f"""
+                        <tr>
+                            <td class="col-no">{idx + 1:02d}</td>
+                            <td class="col-name">{html.escape(row['name'])} ({html.escape(row['team'])})</td>
+                            <td>{row['innings']}</td>
+                            <td>{row['runs']}</td>
+                            <td>{row['highest']}</td>
+                            <td>{_fmt(row['average'])}</td>
+                            <td>{_fmt(row['strike_rate'])}</td>
+                        </tr>
+        """
+
+    html_content += """
+                    </tbody>
+                </table>
+            </div>
+
+            <div class="inning-section">
+                <div class="inning-header">
+                    <span>Top Wicket Takers</span>
+                </div>
+                <table>
+                    <thead>
+                        <tr>
+                            <th class="col-no">No</th>
+                            <th class="col-name">BOWLER</th>
+                            <th>OVERS</th>
+                            <th>WKTS</th>
+                            <th>BEST</th>
+                            <th>AVG</th>
+                            <th>ECON</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+    """
+    for idx, row in enumerate(bowling_rows):
+        html_content += f"""
+                        <tr>
+                            <td class="col-no">{idx + 1:02d}</td>
+                            <td class="col-name">{html.escape(row['name'])} ({html.escape(row['team'])})</td>
+                            <td>{_overs(row['balls'])}</td>
+                            <td>{row['wickets']}</td>
+                            <td>{row['best_wickets']}/{row['best_runs']}</td>
+                            <td>{_fmt(row['average'])}</td>
+                            <td>{_fmt(row['economy'])}</td>
+                        </tr>
+        """
+
+    html_content += """
+                    </tbody>
+                </table>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    return html_content
+
+
+def generate_leaderboard_pdf(data_packets, output_file="leaderboard.pdf", title="Season Leaderboard",
+                             tournament=None, limit=10, log=None):
+    """Aggregate many scorecard packets and render batting/bowling leaderboards to a PDF."""
+    log = log or job_log.default_logger()
+
+    batting, bowling = load_columns(data_packets, tournament=tournament)
+    log.info("Aggregating %s batting and %s bowling rows", batting['name'].size, bowling['name'].size)
+
+    batting_rows = batting_leaderboard(batting_totals(batting), limit=limit)
+    bowling_rows = bowling_leaderboard(bowling_totals(bowling), limit=limit)
+
+    write_pdf(build_leaderboard_html(batting_rows, bowling_rows, title=tournament or title), output_file, log=log)
+    return batting_rows, bowling_rows
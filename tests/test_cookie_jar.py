@@ -0,0 +1,47 @@
+import time
+
+import cookie_jar
+
+
+def _state(*cookies):
+    return {'cookies': [dict({'domain': '.cricheroes.com', 'path': '/'}, **c) for c in cookies]}
+
+
+def test_round_trip_keeps_user_agent(tmp_path):
+    path = str(tmp_path / "jar.json")
+    later = time.time() + 3600
+    cookie_jar.save_storage_state(_state({'name': 'cf_clearance', 'value': 'x', 'expires': later}), "UA/1", path)
+
+    cookies, user_agent = cookie_jar.load_cookies(path)
+    assert [c['name'] for c in cookies] == ['cf_clearance']
+    assert user_agent == "UA/1"
+    assert cookie_jar.expires_at(path) == later
+
+
+def test_expired_cookies_are_dropped(tmp_path):
+    path = str(tmp_path / "jar.json")
+    cookie_jar.save_storage_state(_state({'name': 'old', 'value': 'x', 'expires': time.time() - 1}), "UA/1", path)
+    assert cookie_jar.load_cookies(path) == ([], None)
+
+
+def test_session_cookies_get_a_ttl(tmp_path):
+    path = str(tmp_path / "jar.json")
+    before = time.time()
+    cookie_jar.save_storage_state(_state({'name': 'sid', 'value': 'x', 'expires': -1}), "UA/1", path)
+
+    expires = cookie_jar.expires_at(path)
+    assert before + cookie_jar.SESSION_COOKIE_TTL <= expires <= time.time() + cookie_jar.SESSION_COOKIE_TTL
+
+
+def test_newer_value_replaces_older_and_clear(tmp_path):
+    path = str(tmp_path / "jar.json")
+    later = time.time() + 3600
+    cookie_jar.save_storage_state(_state({'name': 'a', 'value': '1', 'expires': later}), "UA/1", path)
+    cookie_jar.save_storage_state(_state({'name': 'a', 'value': '2', 'expires': later}), "UA/2", path)
+
+    cookies, user_agent = cookie_jar.load_cookies(path)
+    assert [c['value'] for c in cookies] == ['2']
+    assert user_agent == "UA/2"
+
+    cookie_jar.clear(path)
+    assert cookie_jar.load_cookies(path) == ([], None)
@@ -0,0 +1,38 @@
+import http_client
+
+
+def test_is_decodable():
+    assert http_client.is_decodable({})
+    assert http_client.is_decodable({'Content-Encoding': 'gzip'})
+    assert http_client.is_decodable({'Content-Encoding': 'identity'})
+    assert http_client.is_decodable({'Content-Encoding': 'gzip, deflate'})
+    assert not http_client.is_decodable({'Content-Encoding': 'zstd'})
+    assert not http_client.is_decodable({'Content-Encoding': 'gzip, zstd'})
+
+
+def test_brotli_only_when_decodable():
+    assert http_client.is_decodable({'Content-Encoding': 'br'}) == ('br' in http_client.DECODABLE_ENCODINGS)
+    assert http_client.ACCEPT_ENCODING == ", ".join(http_client.DECODABLE_ENCODINGS)
+
+
+def test_classify():
+    page = '<script id="__NEXT_DATA__">{}</script>'
+    assert http_client._classify(200, {}, page) is None
+    assert http_client._classify(200, {'Content-Encoding': 'zstd'}, page) == 'decode_errors'
+    assert http_client._classify(403, {}, page) == 'bad_status'
+    assert http_client._classify(200, {}, "<title>Just a moment...</title>") == 'missing_next_data'
+
+
+def test_fetch_page_gives_up_when_rate_limited(monkeypatch):
+    def acquire(url, timeout=None):
+        raise TimeoutError("no slot")
+
+    class Session:
+        def get(self, *args, **kwargs):
+            raise AssertionError("must not fetch without a rate-limiter slot")
+
+    monkeypatch.setattr(http_client.rate_limiter, "acquire", acquire)
+    before = http_client.get_fallback_stats()['rate_limited']
+
+    assert http_client.fetch_page(Session(), "https://x/1", {}, wait_timeout=1) == (None, None, 'rate_limited')
+    assert http_client.get_fallback_stats()['rate_limited'] == before + 1
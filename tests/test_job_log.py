@@ -0,0 +1,56 @@
+import job_log
+
+
+def test_ring_buffer_keeps_last_lines_and_counts_dropped():
+    job = job_log.JobLog(level="DEBUG", capacity=3)
+    for i in range(5):
+        job.logger.info("line %s", i)
+
+    assert job.lines() == ["[INFO] line 2", "[INFO] line 3", "[INFO] line 4"]
+    assert job.handler.dropped == 2
+    assert job.text().splitlines()[0] == "... 2 earlier lines dropped ..."
+
+
+def test_level_filters_records():
+    job = job_log.JobLog(level="INFO")
+    job.logger.debug("hidden")
+    job.logger.info("shown")
+    assert job.lines() == ["[INFO] shown"]
+
+
+def test_jobs_do_not_share_lines():
+    first, second = job_log.JobLog(), job_log.JobLog()
+    first.logger.info("one")
+    assert second.lines() == []
+
+
+def test_listener_is_throttled_and_flushed(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(job_log.time, "monotonic", lambda: now[0])
+    calls = []
+    job = job_log.JobLog(level="INFO", listener=calls.append, listener_interval=0.25)
+
+    job.logger.info("a")
+    job.logger.info("b")
+    job.logger.info("c")
+    assert calls == ["[INFO] a"]
+
+    now[0] += 0.3
+    job.logger.info("d")
+    assert calls == ["[INFO] a", "[INFO] d"]
+
+    job.logger.info("e")
+    job.flush()
+    assert calls[-1] == "[INFO] e"
+
+    # Nothing new since the last call, so flush is a no-op
+    job.flush()
+    assert len(calls) == 3
+
+
+def test_unthrottled_listener_sees_every_line():
+    calls = []
+    job = job_log.JobLog(level="INFO", listener=calls.append)
+    for i in range(3):
+        job.logger.info("%s", i)
+    assert calls == ["[INFO] 0", "[INFO] 1", "[INFO] 2"]
@@ -0,0 +1,30 @@
+import match_cache
+
+
+def test_match_key_prefers_numeric_id():
+    assert match_cache.match_key("https://cricheroes.com/scorecard/123/cup/a-vs-b") == "123"
+    assert match_cache.match_key("https://cricheroes.in/match/123") == "123"
+    assert match_cache.match_key(" https://cricheroes.com/scorecard/123/summary ") == "123"
+
+
+def test_match_key_hashes_other_urls_stably():
+    key = match_cache.match_key("https://cricheroes.com/some/other/page")
+    assert len(key) == 40
+    assert key == match_cache.match_key("https://cricheroes.com/some/other/page/")
+
+
+def test_match_key_is_idempotent():
+    for url in ("https://cricheroes.com/scorecard/123", "https://cricheroes.com/some/other/page"):
+        key = match_cache.match_key(url)
+        assert match_cache.match_key(key) == key
+
+
+def test_put_get_contains(tmp_path):
+    cache_dir = str(tmp_path)
+    url = "https://cricheroes.com/scorecard/7/cup"
+    assert match_cache.get(url, cache_dir) is None
+    assert not match_cache.contains(url, cache_dir)
+
+    match_cache.put(url, {'meta': {'result': 'Lions won'}}, cache_dir)
+    assert match_cache.contains("https://cricheroes.in/match/7", cache_dir)
+    assert match_cache.get(url, cache_dir) == {'meta': {'result': 'Lions won'}}
@@ -0,0 +1,83 @@
+import pytest
+
+import match_store
+
+
+def _packet(runs, wickets=1, tournament="Cup"):
+    return {
+        'scorecard': [
+            {'teamName': 'Lions', 'inning': {'summary': {'score': f'{runs}/3', 'over': '20.0'}},
+             'batting': [{'name': 'Asha', 'runs': runs, 'balls': 30, '4s': 4, '6s': 1}],
+             'bowling': [{'name': 'Kai', 'overs': '4', 'runs': 25, 'wickets': wickets}]},
+            {'teamName': 'Tigers', 'inning': {'summary': {'score': '90/9', 'over': '20.0'}},
+             'batting': [{'name': 'Kai', 'runs': '12', 'balls': '-'}],
+             'bowling': [{'name': 'Asha', 'overs': '3.2', 'runs': 18, 'wickets': 3}]},
+        ],
+        'meta': {'tournament_name': tournament, 'result': 'Lions won by 10 runs'},
+    }
+
+
+@pytest.fixture
+def conn():
+    conn = match_store.connect(":memory:")
+    yield conn
+    conn.close()
+
+
+def _count(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_overs_to_balls():
+    assert match_store.overs_to_balls("3.2") == 20
+    assert match_store.overs_to_balls(4) == 24
+    assert match_store.overs_to_balls(None) == 0
+
+
+def test_reingest_replaces_match(conn):
+    match_store.ingest_match(conn, "https://cricheroes.com/scorecard/101/cup/a-vs-b", _packet(40))
+    match_store.ingest_match(conn, "https://cricheroes.com/scorecard/101/cup/a-vs-b", _packet(55))
+
+    assert _count(conn, "matches") == 1
+    assert _count(conn, "batting") == 2
+    top = match_store.top_run_scorers(conn)
+    assert (top[0]['player'], top[0]['team'], top[0]['runs']) == ('Asha', 'Lions', 55)
+
+
+def test_url_shapes_of_one_match_share_a_row(conn):
+    match_store.ingest_match(conn, "https://cricheroes.com/scorecard/101/cup/a-vs-b", _packet(40))
+    match_store.ingest_match(conn, "https://cricheroes.com/match/101", _packet(40))
+
+    assert [row[0] for row in conn.execute("SELECT match_key FROM matches")] == ["101"]
+
+
+def test_bulk_ingest_counts_distinct_matches(conn):
+    items = [
+        ("https://cricheroes.com/scorecard/1", _packet(10)),
+        ("https://cricheroes.com/scorecard/2", _packet(20)),
+        ("https://cricheroes.com/scorecard/1", _packet(30)),
+    ]
+    assert match_store.bulk_ingest(conn, items, batch_size=2) == 2
+    assert _count(conn, "matches") == 2
+
+    # The later packet for a repeated match wins
+    runs = {row["runs"] for row in match_store.player_matches(conn, "Asha")["batting"]}
+    assert 30 in runs and 10 not in runs
+
+
+def test_bowling_credited_to_fielding_side(conn):
+    match_store.ingest_match(conn, "https://cricheroes.com/scorecard/7", _packet(40, wickets=2))
+
+    wickets = {(row['player'], row['team']): row['wickets'] for row in match_store.top_wicket_takers(conn)}
+    assert wickets == {('Asha', 'Lions'): 3, ('Kai', 'Tigers'): 2}
+
+
+def test_filters(conn):
+    match_store.bulk_ingest(conn, [
+        ("https://cricheroes.com/scorecard/1", _packet(10, tournament="Cup")),
+        ("https://cricheroes.com/scorecard/2", _packet(20, tournament="League")),
+    ])
+
+    cup = match_store.top_run_scorers(conn, tournament="Cup")
+    assert [(row['player'], row['runs']) for row in cup if row['player'] == 'Asha'] == [('Asha', 10)]
+    assert all(row['team'] == 'Tigers' for row in match_store.top_run_scorers(conn, team="Tigers"))
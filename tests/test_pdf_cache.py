@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+import pdf_cache
+from script import TEMPLATE_VERSION, build_report_html
+
+
+def _packet(motm="Asha"):
+    return {
+        'scorecard': [{'teamName': 'Lions', 'inning': {'summary': {'score': '100/2', 'over': '(20.0 Ov)'}},
+                       'batting': [{'name': 'Asha', 'runs': 50, 'balls': 30}], 'bowling': []}],
+        'meta': {'result': 'Lions won', 'man_of_the_match': motm},
+    }
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "pdfs")
+
+
+def test_key_depends_on_html_version_and_renderer():
+    key = pdf_cache.cache_key("<html/>", "1", "weasyprint")
+    assert key == pdf_cache.cache_key("<html/>", "1", "weasyprint")
+    assert key != pdf_cache.cache_key("<html />", "1", "weasyprint")
+    assert key != pdf_cache.cache_key("<html/>", "2", "weasyprint")
+    assert key != pdf_cache.cache_key("<html/>", "1", "chromium")
+
+
+def test_man_of_the_match_override_changes_key():
+    original = pdf_cache.cache_key(build_report_html(_packet()), TEMPLATE_VERSION, "weasyprint")
+    override = pdf_cache.cache_key(build_report_html(_packet("Ravi")), TEMPLATE_VERSION, "weasyprint")
+    assert original != override
+
+
+def test_round_trip_and_miss(cache_dir):
+    assert pdf_cache.get("missing", cache_dir) is None
+    pdf_cache.put("k", b"%PDF-1", cache_dir)
+    assert pdf_cache.get("k", cache_dir) == b"%PDF-1"
+    assert not [name for name in os.listdir(cache_dir) if name.startswith(".")]
+
+
+def test_eviction_drops_least_recently_used(cache_dir):
+    pdf_cache.put("a", b"x" * 100, cache_dir, max_bytes=250)
+    pdf_cache.put("b", b"x" * 100, cache_dir, max_bytes=250)
+    os.utime(os.path.join(cache_dir, "a.pdf"), (1000, 1000))
+    os.utime(os.path.join(cache_dir, "b.pdf"), (2000, 2000))
+
+    # Reading "a" makes it the most recently used entry
+    assert pdf_cache.get("a", cache_dir) is not None
+    pdf_cache.put("c", b"x" * 100, cache_dir, max_bytes=250)
+
+    assert pdf_cache.get("b", cache_dir) is None
+    assert pdf_cache.get("a", cache_dir) is not None
+    assert pdf_cache.get("c", cache_dir) is not None
+
+
+def test_clear(cache_dir):
+    pdf_cache.put("a", b"x", cache_dir)
+    pdf_cache.clear(cache_dir)
+    assert pdf_cache.get("a", cache_dir) is None
@@ -0,0 +1,42 @@
+import os
+
+import profiling
+
+
+def test_parse_modes_drops_unknown():
+    assert profiling._parse_modes("cpu, MEM") == {"cpu", "mem"}
+    assert profiling._parse_modes("1") == set()
+    assert profiling._parse_modes("cpu,bogus") == {"cpu"}
+    assert profiling._parse_modes("") == set()
+
+
+def test_disabled_is_a_no_op(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_MODES", set())
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path / "profiles"))
+    with profiling.profile_stage("extract"):
+        pass
+    assert not os.path.exists(tmp_path / "profiles")
+
+
+def test_repeated_stages_do_not_overwrite(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_MODES", {"cpu", "mem"})
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    for _ in range(3):
+        with profiling.profile_stage("extract"):
+            sum(range(1000))
+
+    files = os.listdir(tmp_path)
+    assert len([f for f in files if f.endswith(".prof")]) == 3
+    assert len([f for f in files if f.endswith(".mem.txt")]) == 3
+    # Each run's two files share a prefix
+    prefixes = {f.split(".")[0] for f in files}
+    assert len(prefixes) == 3
+
+
+def test_nested_stage_is_covered_by_outer(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_MODES", {"cpu"})
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    with profiling.profile_stage("outer"):
+        with profiling.profile_stage("inner"):
+            pass
+    assert [f.split("-")[0] for f in os.listdir(tmp_path)] == ["outer"]
@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+
+import rate_limiter
+
+URL = "https://cricheroes.com/scorecard/1"
+
+
+@pytest.fixture(autouse=True)
+def limiter_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_DB", str(tmp_path / "rates.db"))
+    monkeypatch.setattr(rate_limiter, "_local", threading.local())
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time: sleeping advances the clock instead of blocking."""
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "time", lambda: now[0])
+    monkeypatch.setattr(rate_limiter.time, "sleep", lambda s: now.__setitem__(0, now[0] + s))
+    return now
+
+
+def test_burst_then_refill(clock):
+    for _ in range(rate_limiter.BURST):
+        assert rate_limiter.acquire(URL) == 0
+
+    waited = rate_limiter.acquire(URL)
+    assert waited == pytest.approx(1.0 / rate_limiter.INITIAL_RATE)
+
+
+def test_timeout(clock):
+    for _ in range(rate_limiter.BURST):
+        rate_limiter.acquire(URL)
+    with pytest.raises(TimeoutError):
+        rate_limiter.acquire(URL, timeout=0.01)
+
+
+def test_aimd(clock):
+    rate_limiter.acquire(URL)
+    rate_limiter.report(URL, 200)
+    increased = rate_limiter.INITIAL_RATE + rate_limiter.INCREASE_STEP
+    assert rate_limiter.current_rate(URL) == pytest.approx(increased)
+
+    rate_limiter.report(URL, 429, retry_after="5")
+    assert rate_limiter.current_rate(URL) == pytest.approx(increased * rate_limiter.DECREASE_FACTOR)
+    # Retry-After blocks the host even though the bucket would refill sooner
+    assert rate_limiter.acquire(URL) == pytest.approx(5.0)
+
+
+def test_hosts_are_independent(clock):
+    for _ in range(rate_limiter.BURST):
+        rate_limiter.acquire(URL)
+    assert rate_limiter.acquire("https://example.com/") == 0
+
+
+def test_retry_after_is_capped(clock):
+    rate_limiter.report(URL, 429, retry_after="3600")
+    assert rate_limiter.acquire(URL) == pytest.approx(rate_limiter.MAX_PAUSE)
+
+
+def test_capped_pause_still_times_out_interactive_callers(clock):
+    rate_limiter.report(URL, 503, retry_after="3600")
+    with pytest.raises(TimeoutError):
+        rate_limiter.acquire(URL, timeout=rate_limiter.MAX_PAUSE / 2)
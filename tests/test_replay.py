@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+import replay
+import script
+
+MATCH_URL = "https://cricheroes.com/scorecard/42/cup/lions-vs-tigers"
+REAL_URL = "https://cricheroes.com/scorecard/42/cup/lions-vs-tigers/summary"
+NEXT_DATA = {'props': {'pageProps': {
+    'scorecard': [{'teamName': 'Lions', 'batting': [{'name': 'Asha', 'runs': 12}], 'bowling': []}],
+    'summaryData': {'data': {'match_summary': {'summary': 'Lions won by 4 runs'}, 'tournament_name': 'Cup'}},
+}}}
+
+
+class _Response:
+    status_code = 200
+    headers = {}
+    text = f'<html><head><meta property="og:url" content="{REAL_URL}"></head></html>'
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    """get_match_data with every network call replaced."""
+    monkeypatch.setattr(script.rate_limiter, "acquire", lambda url, timeout=None: 0)
+    monkeypatch.setattr(script.rate_limiter, "report", lambda *args, **kwargs: None)
+    monkeypatch.setattr(script.requests, "get", lambda url, timeout=None: _Response())
+    scorecard = f'<html><script id="__NEXT_DATA__" type="application/json">{json.dumps(NEXT_DATA)}</script></html>'
+    monkeypatch.setattr(script, "fetch_scorecard", lambda url, log=None, wait_timeout=None: scorecard)
+
+
+def test_record_then_replay_round_trip(tmp_path, offline):
+    live = script.get_match_data(MATCH_URL, record_dir=str(tmp_path))
+    bundle = replay.bundle_dir(str(tmp_path), MATCH_URL)
+
+    assert replay.load(bundle, replay.MANIFEST_FILE)['real_url'] == REAL_URL + "/scorecard"
+    assert replay.load(bundle, replay.NEXT_DATA_FILE) == NEXT_DATA
+    assert replay.load(bundle, replay.PACKET_FILE) == live
+
+    assert replay.replay_match_data(bundle) == live
+    assert live['meta']['result'] == 'Lions won by 4 runs'
+
+
+def test_replay_builds_from_recorded_next_data(tmp_path, offline):
+    script.get_match_data(MATCH_URL, record_dir=str(tmp_path))
+    bundle = replay.bundle_dir(str(tmp_path), MATCH_URL)
+
+    edited = json.loads(json.dumps(NEXT_DATA))
+    edited['props']['pageProps']['summaryData']['data']['tournament_name'] = 'Edited Cup'
+    replay.save(bundle, replay.NEXT_DATA_FILE, edited)
+
+    assert replay.replay_match_data(bundle)['meta']['tournament_name'] == 'Edited Cup'
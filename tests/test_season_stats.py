@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+import season_stats
+
+
+def _packet(team1, team2, batting1=(), bowling1=(), batting2=(), bowling2=(), tournament="Cup"):
+    return {
+        'scorecard': [
+            {'teamName': team1, 'batting': list(batting1), 'bowling': list(bowling1)},
+            {'teamName': team2, 'batting': list(batting2), 'bowling': list(bowling2)},
+        ],
+        'meta': {'tournament_name': tournament},
+    }
+
+
+def _by_player(totals):
+    return {(totals['name'][i], totals['team'][i]): i for i in range(totals['name'].size)}
+
+
+@pytest.mark.parametrize("row, expected", [
+    ({'how_to_out': 'c Smith b Jones'}, True),
+    ({'how_to_out': 'not out'}, False),
+    ({'how_to_out': 'Retired Hurt'}, False),
+    ({'how_to_out': 'retired out'}, True),
+    ({'out_type': 'run out'}, True),
+    ({}, False),
+    ({'how_to_out': None}, False),
+])
+def test_is_out(row, expected):
+    assert season_stats._is_out(row) is expected
+
+
+def test_int_and_balls_columns_tolerate_junk():
+    assert season_stats._int_column([3, "12", None, "-", " 7 "]).tolist() == [3, 12, 0, 0, 7]
+    assert season_stats._balls_column(["3.4", 4, None, "0.5"]).tolist() == [22, 24, 0, 5]
+
+
+def test_batting_totals_across_matches():
+    packets = [
+        _packet("Lions", "Tigers",
+                batting1=[{'name': 'Asha', 'runs': 50, 'balls': 40, '4s': 5, '6s': 1, 'how_to_out': 'b X'},
+                          {'name': 'Ravi', 'runs': '10', 'balls': '12', 'how_to_out': 'not out'}]),
+        _packet("Lions", "Bears",
+                batting1=[{'name': 'Asha', 'runs': 30, 'balls': 20, '4s': 2, '6s': 2, 'how_to_out': 'not out'}]),
+    ]
+    totals = season_stats.batting_totals(season_stats.load_columns(packets)[0])
+    rows = _by_player(totals)
+
+    asha = rows[('Asha', 'Lions')]
+    assert totals['matches'][asha] == 2
+    assert totals['innings'][asha] == 2
+    assert totals['runs'][asha] == 80
+    assert totals['outs'][asha] == 1
+    assert totals['highest'][asha] == 50
+    assert totals['fours'][asha] == 7
+    assert totals['average'][asha] == pytest.approx(80.0)
+    assert totals['strike_rate'][asha] == pytest.approx(80 / 60 * 100)
+
+    ravi = rows[('Ravi', 'Lions')]
+    assert np.isnan(totals['average'][ravi])
+
+
+def test_same_name_on_different_teams_stays_apart():
+    packets = [_packet("Lions", "Tigers",
+                       batting1=[{'name': 'Sam', 'runs': 20, 'balls': 10}],
+                       batting2=[{'name': 'Sam', 'runs': 5, 'balls': 10}])]
+    totals = season_stats.batting_totals(season_stats.load_columns(packets)[0])
+    rows = _by_player(totals)
+
+    assert totals['runs'][rows[('Sam', 'Lions')]] == 20
+    assert totals['runs'][rows[('Sam', 'Tigers')]] == 5
+
+
+def test_bowling_totals_credit_fielding_side_and_best_figures():
+    packets = [
+        # Lions bat first, so the first innings' bowlers play for Tigers
+        _packet("Lions", "Tigers",
+                bowling1=[{'name': 'Kai', 'overs': '4', 'runs': 20, 'wickets': 2}]),
+        _packet("Bears", "Tigers",
+                bowling1=[{'name': 'Kai', 'overs': '3.3', 'runs': 15, 'wickets': 2}]),
+        _packet("Wolves", "Tigers",
+                bowling1=[{'name': 'Kai', 'overs': '2', 'runs': 30, 'wickets': 1}]),
+    ]
+    totals = season_stats.bowling_totals(season_stats.load_columns(packets)[1])
+    kai = _by_player(totals)[('Kai', 'Tigers')]
+
+    assert totals['balls'][kai] == 24 + 21 + 12
+    assert totals['wickets'][kai] == 5
+    assert totals['runs'][kai] == 65
+    assert (totals['best_wickets'][kai], totals['best_runs'][kai]) == (2, 15)
+    assert totals['economy'][kai] == pytest.approx(65 / 57 * 6)
+
+
+def test_tournament_filter_and_leaderboard_order():
+    packets = [
+        _packet("Lions", "Tigers", batting1=[{'name': 'A', 'runs': 10, 'balls': 5},
+                                             {'name': 'B', 'runs': 10, 'balls': 10},
+                                             {'name': 'C', 'runs': 40, 'balls': 30}]),
+        _packet("Lions", "Tigers", batting1=[{'name': 'D', 'runs': 99, 'balls': 50}], tournament="Other"),
+    ]
+    totals = season_stats.batting_totals(season_stats.load_columns(packets, tournament="Cup")[0])
+    board = season_stats.batting_leaderboard(totals, limit=3)
+
+    # Runs first, strike rate breaks the tie
+    assert [row['name'] for row in board] == ['C', 'A', 'B']
+    assert board[0]['team'] == 'Lions'
+
+
+def test_empty_input():
+    batting, bowling = season_stats.load_columns([])
+    assert season_stats.batting_totals(batting)['name'].size == 0
+    assert season_stats.bowling_leaderboard(season_stats.bowling_totals(bowling)) == []
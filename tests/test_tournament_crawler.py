@@ -0,0 +1,74 @@
+import tournament_crawler
+
+TOURNAMENT = "https://cricheroes.com/tournament/55/summer-cup"
+
+
+def _by_id(matches):
+    return {m['match_id']: m for m in matches}
+
+
+def test_entry_url():
+    base = "https://cricheroes.com"
+    assert tournament_crawler._entry_url({'match_url': "/scorecard/9/cup/a-vs-b"}, base) == \
+        "https://cricheroes.com/scorecard/9/cup/a-vs-b"
+    assert tournament_crawler._entry_url({'share_url': "https://cricheroes.in/match/9"}, base) == \
+        "https://cricheroes.in/match/9"
+    # Only match links count, and an entry with just an id has no URL
+    assert tournament_crawler._entry_url({'logo_url': "/images/9.png"}, base) is None
+    assert tournament_crawler._entry_url({'match_id': 9}, base) is None
+
+
+def test_is_finished():
+    assert tournament_crawler._is_finished({'status': 'Past'})
+    assert tournament_crawler._is_finished({'match_status': 'completed'})
+    assert tournament_crawler._is_finished({'winning_team_id': 4})
+    assert tournament_crawler._is_finished({'match_summary': {'summary': 'Lions won by 4 wickets'}})
+    assert tournament_crawler._is_finished({'match_summary': 'Match tied'})
+    assert not tournament_crawler._is_finished({'status': 'live'})
+    assert not tournament_crawler._is_finished({'match_summary': {'summary': 'Lions need 20 runs'}})
+    assert not tournament_crawler._is_finished({})
+
+
+def test_discover_matches_finds_nested_entries():
+    next_data = {'props': {'pageProps': {'rounds': [
+        {'matches': [{'match_id': 1, 'status': 'past'}, {'match_id': 2, 'status': 'upcoming'}]},
+    ]}}}
+    matches = _by_id(tournament_crawler.discover_matches(next_data, TOURNAMENT))
+
+    assert set(matches) == {'1', '2'}
+    assert matches['1']['finished'] and not matches['2']['finished']
+    assert matches['1']['url'] == "https://cricheroes.com/scorecard/1"
+
+
+def test_discover_matches_merges_entries_for_one_id():
+    next_data = {
+        'matches': [{'match_id': 1, 'status': 'past'}],
+        'player': {'last_match': {'match_id': 1, 'match_url': '/scorecard/1/cup/lions-vs-tigers'}},
+        'featured': {'match_id': '1'},
+    }
+    matches = tournament_crawler.discover_matches(next_data, TOURNAMENT)
+
+    assert matches == [{
+        'match_id': '1',
+        'url': "https://cricheroes.com/scorecard/1/cup/lions-vs-tigers",
+        'finished': True,
+    }]
+
+
+def test_prefetch_skips_live_and_cached(monkeypatch):
+    scraped = []
+    stored = []
+    monkeypatch.setattr(tournament_crawler.match_cache, "contains", lambda url: url.endswith("/2"))
+    monkeypatch.setattr(tournament_crawler.match_cache, "put", lambda url, packet: stored.append(url))
+    monkeypatch.setattr(tournament_crawler, "get_match_data",
+                        lambda url, log=None: scraped.append(url) or {'meta': {'result': 'Lions won by 3 runs'}})
+
+    matches = [
+        {'match_id': '1', 'url': "https://x/scorecard/1", 'finished': True},
+        {'match_id': '2', 'url': "https://x/scorecard/2", 'finished': True},
+        {'match_id': '3', 'url': "https://x/scorecard/3", 'finished': False},
+    ]
+    status = tournament_crawler.prefetch(matches, rate_per_minute=6000)
+
+    assert scraped == stored == ["https://x/scorecard/1"]
+    assert status == {'queued': 1, 'fetched': 1, 'cached': 1, 'failed': 0}
@@ -0,0 +1,42 @@
+import watch
+
+
+def _packet(batting, score='50/2', result='Live'):
+    return {
+        'scorecard': [{'teamName': 'Lions', 'inning': {'summary': {'score': score, 'over': '10.0'}},
+                       'batting': batting, 'bowling': []}],
+        'meta': {'result': result},
+    }
+
+
+def test_first_snapshot_is_a_change():
+    assert watch.diff_snapshots(None, watch.snapshot(_packet([]))) == ["initial snapshot"]
+
+
+def test_identical_snapshots_have_no_changes():
+    packet = _packet([{'name': 'Asha', 'runs': 10, 'balls': 8}])
+    assert watch.diff_snapshots(watch.snapshot(packet), watch.snapshot(packet)) == []
+
+
+def test_changed_added_and_removed_rows():
+    old = watch.snapshot(_packet([{'name': 'Asha', 'runs': 10}, {'name': 'Ravi', 'runs': 0}]))
+    new = watch.snapshot(_packet([{'name': 'Asha', 'runs': 14}, {'name': 'Kai', 'runs': 1}], score='55/2'))
+
+    changes = watch.diff_snapshots(old, new)
+    assert "Lions: 50/2 10.0 -> 55/2 10.0" in changes
+    assert any(c.startswith("Lions batting: Asha") for c in changes)
+    assert "Lions batting: new row for Kai" in changes
+    assert "Lions batting: row removed for Ravi" in changes
+
+
+def test_same_name_rows_do_not_collapse():
+    old = watch.snapshot(_packet([{'name': 'Sam', 'runs': 1}, {'name': 'Sam', 'runs': 2}]))
+    new = watch.snapshot(_packet([{'name': 'Sam', 'runs': 1}, {'name': 'Sam', 'runs': 6}]))
+
+    assert len(old['innings'][0]['batting']) == 2
+    assert watch.diff_snapshots(old, new) == ["Lions batting: Sam (#2) (2, 0, 0, 0) -> (6, 0, 0, 0)"]
+
+
+def test_match_finished():
+    assert watch.match_finished(_packet([], result="Lions won by 5 wickets"))
+    assert not watch.match_finished(_packet([], result="Lions need 20 runs"))
@@ -0,0 +1,202 @@
+import json
+import os
+import sys
+import threading
+import time
+from urllib.parse import urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+import cookie_jar
+import http_client
+import job_log
+import match_cache
+from script import BROWSER_HEADERS, get_match_data
+from watch import FINAL_RESULT_MARKERS, match_finished
+
+# Default prefetch pace; keep it gentle, every match is a full scrape
+RATE_PER_MINUTE = 6
+
+# Used when a match entry only carries its id; get_match_data follows og:url from here
+MATCH_URL_TEMPLATE = "{base}/scorecard/{match_id}"
+
+FINISHED_STATUSES = ("past", "completed", "complete", "finished", "result", "ended")
+
+
+def fetch_next_data(url, log=None):
+    """Fetch a CricHeroes page on the fast path and return its parsed __NEXT_DATA__."""
+    log = log or job_log.default_logger()
+
+    session = requests.Session()
+    headers = dict(BROWSER_HEADERS)
+    jar_user_agent = cookie_jar.apply_to_session(session)
+    if jar_user_agent:
+        headers["User-Agent"] = jar_user_agent
+
+    content, status_code, reason = http_client.fetch_page(session, url, headers, timeout=15)
+    if not content:
+        raise Exception(f"Could not fetch tournament page ({reason}, Status: {status_code})")
+
+    soup = BeautifulSoup(content, "html.parser")
+    next_data_script = soup.find("script", id="__NEXT_DATA__")
+    if not next_data_script:
+        raise Exception("Could not find __NEXT_DATA__ in tournament page")
+    log.debug("Tournament page fetched: %s characters", len(content))
+    return json.loads(next_data_script.string)
+
+
+def _walk(obj):
+    """Yield every dict nested anywhere inside a JSON document."""
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            yield item
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+
+
+def _entry_url(entry, base):
+    """The match URL an entry links to, or None when it only carries the id."""
+    for key, value in entry.items():
+        if isinstance(value, str) and "url" in key.lower() and ("/scorecard/" in value or "/match/" in value):
+            return urljoin(base, value)
+    return None
+
+
+def _is_finished(entry):
+    for key in ("status", "match_status"):
+        status = entry.get(key)
+        if isinstance(status, str) and status.strip().lower() in FINISHED_STATUSES:
+            return True
+    if entry.get("winning_team_id") or entry.get("winning_team"):
+        return True
+
+    summary = entry.get("match_summary")
+    if isinstance(summary, dict):
+        summary = summary.get("summary")
+    if isinstance(summary, str):
+        summary = summary.lower()
+        return any(marker in summary for marker in FINAL_RESULT_MARKERS)
+    return False
+
+
+def discover_matches(next_data, tournament_url):
+    """
+    Pull every match referenced in a tournament page's __NEXT_DATA__.
+    Returns a list of {'match_id', 'url', 'finished'} dicts, one per match id.
+
+    The same id can appear in several places (the fixture list, a player's
+    last match, a featured-match widget), so entries are merged: a match is
+    finished if any entry says so, and an explicit URL beats the template.
+    """
+    parsed = urlparse(tournament_url)
+    base = f"{parsed.scheme}://{parsed.netloc}"
+
+    matches = {}
+    for entry in _walk(next_data):
+        match_id = entry.get("match_id")
+        if not match_id:
+            continue
+        match = matches.setdefault(str(match_id), {'match_id': str(match_id), 'url': None, 'finished': False})
+        match['url'] = match['url'] or _entry_url(entry, base)
+        match['finished'] = match['finished'] or _is_finished(entry)
+
+    for match in matches.values():
+        if match['url'] is None:
+            match['url'] = MATCH_URL_TEMPLATE.format(base=base, match_id=match['match_id'])
+    return list(matches.values())
+
+
+def prefetch(matches, rate_per_minute=RATE_PER_MINUTE, stop_event=None, status=None, log=None):
+    """
+    Scrape finished, not-yet-cached matches into match_cache, at most
+    `rate_per_minute` scrapes per minute. Live matches are skipped since their
+    scorecards would go stale.
+    """
+    log = log or job_log.default_logger()
+    status = status if status is not None else {}
+    status.update({'queued': 0, 'fetched': 0, 'cached': 0, 'failed': 0})
+    interval = 60.0 / rate_per_minute
+
+    queue = []
+    for m in matches:
+        if not m['finished']:
+            continue
+        if match_cache.contains(m['url']):
+            status['cached'] += 1
+        else:
+            queue.append(m)
+    status['queued'] = len(queue)
+    log.info("Prefetching %s matches (%s already cached)", len(queue), status['cached'])
+
+    for i, m in enumerate(queue):
+        if stop_event is not None and stop_event.is_set():
+            break
+        started = time.monotonic()
+        try:
+            data_packet = get_match_data(m['url'], log=log)
+            if match_finished(data_packet):
+                match_cache.put(m['url'], data_packet)
+                status['fetched'] += 1
+                log.info("✓ Prefetched match %s", m['match_id'])
+            else:
+                log.debug("Match %s has no result yet, not caching", m['match_id'])
+        except Exception as e:
+            status['failed'] += 1
+            log.warning("✗ Prefetch of match %s failed: %s", m['match_id'], e)
+
+        if i < len(queue) - 1:
+            wait = interval - (time.monotonic() - started)
+            if wait > 0:
+                if stop_event is not None:
+                    stop_event.wait(wait)
+                else:
+                    time.sleep(wait)
+
+    return status
+
+
+def start_prefetch(tournament_url, rate_per_minute=RATE_PER_MINUTE, log=None):
+    """
+    Discover a tournament's matches and prefetch them on a background thread.
+    Returns (thread, stop_event, status); set stop_event to stop early.
+    """
+    log = log or job_log.default_logger()
+    stop_event = threading.Event()
+    status = {'discovered': 0}
+
+    def worker():
+        try:
+            matches = discover_matches(fetch_next_data(tournament_url, log=log), tournament_url)
+            status['discovered'] = len(matches)
+            prefetch(matches, rate_per_minute, stop_event=stop_event, status=status, log=log)
+        except Exception as e:
+            status['error'] = str(e)
+            log.error("✗ Tournament crawl failed: %s", e)
+
+    thread = threading.Thread(target=worker, daemon=True, name="tournament-prefetch")
+    thread.start()
+    return thread, stop_event, status
+
+
+def run():
+    url = sys.argv[1] if len(sys.argv) > 1 else os.getenv("TOURNAMENT_URL")
+    if not url:
+        print("Usage: python tournament_crawler.py <tournament URL> [matches per minute]")
+        return
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else RATE_PER_MINUTE
+
+    thread, stop_event, status = start_prefetch(url, rate_per_minute=rate)
+    try:
+        thread.join()
+    except KeyboardInterrupt:
+        stop_event.set()
+        thread.join()
+    print(f"\n✓ Prefetch finished: {status}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,188 @@
+import os
+import time
+
+import job_log
+from script import get_match_data, generate_pdf
+
+# Poll quickly while the score is moving, back off while nothing happens
+MIN_INTERVAL = 30
+MAX_INTERVAL = 300
+
+# Phrases CricHeroes uses in match_summary once a match has a result
+FINAL_RESULT_MARKERS = ("won by", "won the match", "tied", "drawn", "abandoned", "no result")
+
+
+def _keyed_rows(rows, fields):
+    """
+    Map each scorecard row to its stat tuple, keyed by (name, occurrence) so
+    two players who share a name stay separate rows.
+    """
+    keyed = {}
+    seen = {}
+    for row in rows:
+        name = row.get('name', '')
+        n = seen.get(name, 0)
+        seen[name] = n + 1
+        keyed[(name, n)] = tuple(row.get(field, 0) for field in fields)
+    return keyed
+
+
+def _label(key):
+    name, n = key
+    return f"{name} (#{n + 1})" if n else name
+
+
+def snapshot(data_packet):
+    """
+    Reduce a data packet to the fields that show up on the scorecard so two
+    scrapes can be compared cheaply.
+    """
+    innings = []
+    for inning in data_packet.get('scorecard', []):
+        summary = inning.get('inning', {}).get('summary', {})
+        innings.append({
+            'team': inning.get('teamName', 'Unknown'),
+            'score': summary.get('score', '0/0'),
+            'over': summary.get('over', ''),
+            'batting': _keyed_rows(inning.get('batting', []), ('runs', 'balls', '4s', '6s')),
+            'bowling': _keyed_rows(inning.get('bowling', []), ('overs', 'runs', 'wickets')),
+        })
+
+    meta_info = data_packet.get('meta', {})
+    return {
+        'innings': innings,
+        'result': meta_info.get('result', 'N/A'),
+        'man_of_the_match': meta_info.get('man_of_the_match', 'N/A'),
+    }
+
+
+def _diff_rows(kind, team, old_rows, new_rows):
+    changes = []
+    for key, values in new_rows.items():
+        if key not in old_rows:
+            changes.append(f"{team} {kind}: new row for {_label(key)}")
+        elif old_rows[key] != values:
+            changes.append(f"{team} {kind}: {_label(key)} {old_rows[key]} -> {values}")
+    for key in old_rows:
+        if key not in new_rows:
+            changes.append(f"{team} {kind}: row removed for {_label(key)}")
+    return changes
+
+
+def diff_snapshots(previous, current):
+    """Return a list of human-readable changes between two snapshots (empty when identical)."""
+    if previous is None:
+        return ["initial snapshot"]
+
+    changes = []
+    for old in previous['innings'][len(current['innings']):]:
+        changes.append(f"innings removed: {old['team']}")
+    for i, inning in enumerate(current['innings']):
+        team = inning['team']
+        if i >= len(previous['innings']):
+            changes.append(f"new innings: {team}")
+            continue
+
+        old = previous['innings'][i]
+        if (old['score'], old['over']) != (inning['score'], inning['over']):
+            changes.append(f"{team}: {old['score']} {old['over']} -> {inning['score']} {inning['over']}")
+        changes += _diff_rows("batting", team, old['batting'], inning['batting'])
+        changes += _diff_rows("bowling", team, old['bowling'], inning['bowling'])
+
+    for key in ('result', 'man_of_the_match'):
+        if previous[key] != current[key]:
+            changes.append(f"{key}: {previous[key]} -> {current[key]}")
+
+    return changes
+
+
+def match_finished(data_packet):
+    """True once match_summary reports a result."""
+    result = str(data_packet.get('meta', {}).get('result', '')).lower()
+    return any(marker in result for marker in FINAL_RESULT_MARKERS)
+
+
+def watch_match(url, output_file="scorecard.pdf", min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL,
+                max_polls=None, on_change=None, log=None):
+    """
+    Poll a live match and re-render the PDF only when the scorecard changes.
+
+    The interval resets to `min_interval` after every change and doubles (up to
+    `max_interval`) while nothing moves or a scrape fails. Stops on its own
+    once the match has a result, or after `max_polls` polls.
+    `on_change(data_packet, changes)` is called after each re-render.
+    """
+    log = log or job_log.default_logger()
+
+    previous = None
+    data_packet = None
+    interval = min_interval
+    polls = 0
+    renders = 0
+    finished = False
+
+    while True:
+        polls += 1
+        try:
+            data_packet = get_match_data(url, log=log)
+        except Exception as e:
+            log.warning("✗ Poll %s failed: %s", polls, e)
+            data_packet = None
+
+        if data_packet is not None:
+            current = snapshot(data_packet)
+            changes = diff_snapshots(previous, current)
+            finished = match_finished(data_packet)
+
+            if changes:
+                log.info("✓ Poll %s: %s change(s), re-rendering", polls, len(changes))
+                for change in changes:
+                    log.debug("  %s", change)
+                try:
+                    generate_pdf(data_packet, output_file, log=log)
+                    renders += 1
+                    if on_change:
+                        on_change(data_packet, changes)
+                except Exception as e:
+                    # Leave `previous` alone so the next poll retries the render
+                    log.warning("✗ Render after poll %s failed: %s", polls, e)
+                    interval = min(interval * 2, max_interval)
+                    current = previous
+                else:
+                    interval = min_interval
+            else:
+                log.debug("Poll %s: no changes", polls)
+                interval = min(interval * 2, max_interval)
+
+            previous = current
+        else:
+            interval = min(interval * 2, max_interval)
+
+        if finished:
+            log.info("✓ Match finished: %s", data_packet.get('meta', {}).get('result', 'N/A'))
+            break
+        if max_polls and polls >= max_polls:
+            break
+
+        log.debug("Next poll in %ss", interval)
+        time.sleep(interval)
+
+    return {'polls': polls, 'renders': renders, 'finished': finished, 'data_packet': data_packet}
+
+
+def run():
+    url = os.getenv("MATCH_URL")
+    if not url:
+        print("Error: MATCH_URL environment variable not set. Please set it in .env file.")
+        return
+
+    print("="*60)
+    print("Watching live match")
+    print("="*60)
+
+    stats = watch_match(url, "scorecard.pdf")
+    print(f"\n✓ Stopped after {stats['polls']} polls, {stats['renders']} renders.")
+
+
+if __name__ == "__main__":
+    run()